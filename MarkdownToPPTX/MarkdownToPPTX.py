@@ -1,24 +1,70 @@
 # MarkdownToPPTX.py
 
+import itertools
+import logging.config
 import os
 import re
-from typing import List, Tuple, Optional
-from pathlib import Path
+import time
+from typing import Iterable, Iterator, List, Tuple, Optional
 from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.util import Cm
 from pptx.enum.text import PP_ALIGN
+from MarkdownToPPTX.modules.limits import (
+    CancellationToken, ConversionAborted, ConversionCancelled, ConversionGuard, ConversionLimits,
+)
+from MarkdownToPPTX.modules.metrics import MetricsRegistry, default_registry
+from MarkdownToPPTX.modules.naming import (
+    NAMING_SCHEMES, next_free_path, release_output_path, reserve_output_path, write_atomically,
+)
+from MarkdownToPPTX.modules.native import NativeDeckWriter
+from MarkdownToPPTX.modules.tables import (
+    ALIGN_CENTER, ALIGN_LEFT, ALIGN_RIGHT, layout_columns, parse_table, separator_alignments,
+)
+
+# Rendering backends accepted by convert()
+BACKENDS = ('pptx', 'native')
+
+# Table column alignments as python-pptx values
+PP_ALIGNMENTS = {ALIGN_LEFT: PP_ALIGN.LEFT, ALIGN_CENTER: PP_ALIGN.CENTER, ALIGN_RIGHT: PP_ALIGN.RIGHT}
+
+# Line of three or more dashes between two slides
+SLIDE_SEPARATOR = re.compile(r'\n---+\s*\n')
+
+
+def _iter_sections(text: str) -> Iterator[str]:
+    """
+    Split markdown text at the slide separators, like re.split() but one section at a time.
+    
+    Args:
+        text (str): The markdown content
+        
+    Yields:
+        str: The text between two separators
+    """
+    start = 0
+    for separator in SLIDE_SEPARATOR.finditer(text):
+        yield text[start:separator.start()]
+        start = separator.end()
+    yield text[start:]
 
 
 class MarkdownToPPTX:
-    def __init__(self, template_path: Optional[str] = None):
+    def __init__(self, template_path: Optional[str] = None, metrics: Optional[MetricsRegistry] = None):
         """
         Initialize the converter with a new presentation.
         Args:
             template_path (str, optional): PPTX template file path.
             if provided, creates a presentation based on the template;
             if not provided, creates a new blank presentation.
+            metrics (MetricsRegistry, optional): Registry to record conversion metrics in,
+            defaults to the process-wide registry.
         """
+        self.metrics = metrics or default_registry
+        self.template_path = template_path
+        # Limits and cancellation of the running conversion; unlimited outside convert()
+        self.guard = ConversionGuard()
+
         # default slide size
         default_width = Inches(13.333) # 16:9
         #default_width = Inches(10) # 4:3
@@ -58,16 +104,35 @@ class MarkdownToPPTX:
         Returns:
             list: List of slide dictionaries containing title and content
         """
-        # Split the markdown by slide separators
-        slide_sections = re.split(r'\n---+\s*\n', markdown_text.strip())
-        slides_data = []
+        return list(self.iter_slides(markdown_text))
+
+    def iter_slides(self, markdown_text: str) -> Iterator[dict]:
+        """
+        Parse markdown text lazily, yielding one slide dictionary at a time.
+        
+        Args:
+            markdown_text (str): The markdown content to parse
+            
+        Yields:
+            dict: Slide dictionary containing title and content
+        """
+        # Limits of the running conversion, applied as the slides are built
+        guard = self.guard
+        max_items = guard.limits.max_items_per_slide
+        max_cells = guard.limits.max_table_cells
+        tick = guard.tick
         
-        for section in slide_sections:
+        # Split the markdown by slide separators; sections are cut out as they are
+        # reached so only one of them is held besides the text itself
+        for section in _iter_sections(markdown_text.strip()):
             lines = section.strip().split('\n')
             current_slide = None
             
             i = 0
             while i < len(lines):
+                tick()
+                if max_items is not None and current_slide is not None:
+                    guard.limit_parsed_items(current_slide)
                 line = lines[i].rstrip()  # Keep leading spaces for indentation
                 
                 # Handle headers (slide titles and content headers)
@@ -79,7 +144,7 @@ class MarkdownToPPTX:
                     # # and ## create new slides
                     if level <= 2:
                         if current_slide:
-                            slides_data.append(current_slide)
+                            yield current_slide
                         current_slide = {
                             'title': title,
                             'headers': [],
@@ -146,7 +211,7 @@ class MarkdownToPPTX:
                         j += 1
                         
                         # Check if next line is a separator line (:--- format)
-                        if j < len(lines) and re.match(r'^\s*\|?(\s*:?-+:?\s*\|)+\s*:?-+:?\s*\|?\s*$', lines[j]):
+                        if j < len(lines) and self._is_table_separator(lines[j]):
                             table_lines.append(lines[j])  # Add separator line
                             j += 1
                             
@@ -158,9 +223,12 @@ class MarkdownToPPTX:
                     
                     # If we found a valid table
                     if len(table_lines) >= 2:  # Need at least header + separator
+                        # Parsed once here; renderers use the cell matrix directly.
+                        # An oversized table stops being read once it is over the cap
+                        table = parse_table(table_lines, max_cells, tick)
                         current_slide['content'].append({
                             'type': 'table',
-                            'lines': table_lines
+                            'table': guard.limit_table(table)
                         })
                         i = j - 1  # Skip processed lines
                     else:
@@ -194,11 +262,11 @@ class MarkdownToPPTX:
             
             # Add the last slide of this section
             if current_slide:
+                if max_items is not None:
+                    guard.limit_parsed_items(current_slide)
                 # Combine headers and content
                 current_slide['content'] = current_slide['headers'] + current_slide['content']
-                slides_data.append(current_slide)
-                
-        return slides_data
+                yield current_slide
 
     def _handle_regular_text(self, line: str, current_slide: dict) -> None:
         """
@@ -217,6 +285,22 @@ class MarkdownToPPTX:
                     'text': line.strip()
                 })
 
+    def _is_table_separator(self, line: str) -> bool:
+        r"""
+        Check whether a line is a table separator row (| :--- | :---: | ---: |).
+        
+        Equivalent to matching ^\s*\|?(\s*:?-+:?\s*\|)+\s*:?-+:?\s*\|?\s*$, but done with
+        a single split so it runs in linear time on any input: at least two cells,
+        each made of dashes with optional alignment colons.
+        
+        Args:
+            line (str): The line to check
+            
+        Returns:
+            bool: True if the line is a separator row
+        """
+        return separator_alignments(line) is not None
+
     def parse_table_data(self, table_lines: List[str]) -> List[List[str]]:
         """
         Parse table lines into structured data.
@@ -226,29 +310,9 @@ class MarkdownToPPTX:
             
         Returns:
             List[List[str]]: Table data as list of rows, each row is a list of cell values
+            (short rows are padded with empty cells)
         """
-        table_data = []
-        in_header = True
-        
-        for line in table_lines:
-            # Skip separator lines (:--- format)
-            if re.match(r'^\s*\|?(\s*:?-+:?\s*\|)+\s*:?-+:?\s*\|?\s*$', line):
-                in_header = False
-                continue
-                
-            # Parse row data
-            cells = [cell.strip() for cell in line.split('|')]
-            
-            # Remove empty cells at start and end
-            if cells and cells[0] == '':
-                cells = cells[1:]
-            if cells and cells[-1] == '':
-                cells = cells[:-1]
-                
-            if cells:
-                table_data.append(cells)
-                
-        return table_data
+        return parse_table(table_lines).rows()
 
     def remove_bold_formatting(self, text: str) -> Tuple[str, List[Tuple[int, int]]]:
         """
@@ -261,21 +325,52 @@ class MarkdownToPPTX:
             Tuple[str, List[Tuple[int, int]]]: Clean text and list of (start, end) positions for bold formatting
         """
         bold_positions = []
-        clean_text = text
-        offset = 0
+        pieces = []
+        clean_length = 0
+        copied = 0  # end of the source text copied so far
         
         # Find all **bold** patterns
-        for match in re.finditer(r'\*\*(.*?)\*\*', text):
-            # Calculate positions in the cleaned text
-            start = match.start() - offset
-            end = start + len(match.group(1))
-            bold_positions.append((start, end))
+        for start, end in self._find_bold_spans(text):
+            pieces.append(text[copied:start])
+            clean_length += start - copied
             
-            # Remove the ** markers from the text
-            clean_text = clean_text[:match.start()-offset] + match.group(1) + clean_text[match.end()-offset:]
-            offset += 4  # 2 characters removed at start and 2 at end
+            # Keep the inner text and record its position in the cleaned text
+            inner = text[start + 2:end - 2]
+            bold_positions.append((clean_length, clean_length + len(inner)))
+            pieces.append(inner)
+            clean_length += len(inner)
+            copied = end
+        pieces.append(text[copied:])
+            
+        return ''.join(pieces), bold_positions
+
+    def _find_bold_spans(self, text: str) -> Iterator[Tuple[int, int]]:
+        r"""
+        Find **bold** spans, matching what re.finditer(r'\*\*(.*?)\*\*', text) finds,
+        in linear time.
+        
+        Args:
+            text (str): Text that may contain bold formatting
             
-        return clean_text, bold_positions
+        Yields:
+            Tuple[int, int]: (start, end) of each span in text, markers included
+        """
+        search = 0
+        while True:
+            opener = text.find('**', search)
+            if opener == -1:
+                return
+            closer = text.find('**', opener + 2)
+            if closer == -1:
+                # No closing marker anywhere after this point
+                return
+            newline = text.find('\n', opener + 2, closer)
+            if newline != -1:
+                # Bold text does not span lines; nothing before the newline can close
+                search = newline + 1
+                continue
+            yield opener, closer + 2
+            search = closer + 2
 
     def apply_text_formatting(self, paragraph, bold_ranges: List[Tuple[int, int]]) -> None:
         """
@@ -347,7 +442,7 @@ class MarkdownToPPTX:
             p.font.size = Pt(44)
             p.font.bold = True
 
-
+        self.metrics.slides.inc()
         return slide
 
     def create_content_slide(self, title: str, content: List[dict]) -> object:
@@ -407,6 +502,8 @@ class MarkdownToPPTX:
         current_top = Inches(1.5)
         left_margin = Inches(1)
         content_width = Inches(8)
+        # Wide tables may grow to the slide width, less the margins
+        table_max_width = self.presentation.slide_width - 2 * left_margin
         
         # 添加内容
         for item in content:
@@ -446,46 +543,59 @@ class MarkdownToPPTX:
                 if bold_positions:
                     self.apply_text_formatting(p, bold_positions)
             elif item['type'] == 'table':
-                # 解析并添加表格
-                table_data = self.parse_table_data(item['lines'])
-                if table_data:
-                    rows = len(table_data)
-                    cols = max(len(row) for row in table_data) if table_data else 0
+                # 添加表格 (parsed by parse_markdown)
+                table_data = self.guard.limit_table(item['table'])
+                rows, cols = table_data.n_rows, table_data.n_cols
+                if rows > 0 and cols > 0:
+                    cells = [[self.remove_bold_formatting(text)[0] for text in column]
+                             for column in table_data.columns]
+                    # 列宽按单元格文本长度计算
+                    col_widths, font_size = layout_columns(cells, content_width, table_max_width)
                     
-                    if rows > 0 and cols > 0:
-                        # 创建表格
-                        table_height = min(Inches(4), Inches(0.3 * rows))
-                        table = slide.shapes.add_table(
-                            rows, cols,
-                            left_margin,
-                            current_top,
-                            content_width,
-                            table_height
-                        ).table
-                        
-                        # 填充表格
-                        for row_idx, row_data in enumerate(table_data):
-                            for col_idx, cell_data in enumerate(row_data):
-                                if row_idx < rows and col_idx < cols:
-                                    clean_cell_data, _ = self.remove_bold_formatting(cell_data)
-                                    table.cell(row_idx, col_idx).text = clean_cell_data
-                        
-                        # 设置表格样式
-                        for row_idx in range(rows):
-                            for col_idx in range(cols):
-                                cell = table.cell(row_idx, col_idx)
-                                for paragraph in cell.text_frame.paragraphs:
-                                    paragraph.font.size = Pt(12)
-                                    if row_idx == 0:  # 标题行
-                                        paragraph.font.bold = True
-                        
-                        current_top += table_height + Inches(0.2)
+                    # 创建表格
+                    table_height = min(Inches(4), Inches(0.3 * rows))
+                    table = slide.shapes.add_table(
+                        rows, cols,
+                        left_margin,
+                        current_top,
+                        sum(col_widths),
+                        table_height
+                    ).table
+                    for col_idx, col_width in enumerate(col_widths):
+                        table.columns[col_idx].width = col_width
+                    
+                    # 填充表格并设置样式
+                    for row_idx in range(rows):
+                        self.guard.check()
+                        for col_idx in range(cols):
+                            cell = table.cell(row_idx, col_idx)
+                            cell.text = cells[col_idx][row_idx]
+                            alignment = PP_ALIGNMENTS.get(table_data.alignments[col_idx])
+                            for paragraph in cell.text_frame.paragraphs:
+                                paragraph.font.size = Pt(font_size)
+                                if alignment is not None:
+                                    paragraph.alignment = alignment
+                                if row_idx == 0:  # 标题行
+                                    paragraph.font.bold = True
+                    
+                    current_top += table_height + Inches(0.2)
+                    self.metrics.tables.inc()
         
+        self.metrics.slides.inc()
         return slide
 
 
 
 
+    def save(self, output_path: str) -> None:
+        """
+        Save the presentation.
+        
+        Args:
+            output_path (str): Path of the .pptx file to write
+        """
+        self.presentation.save(output_path)
+
     def get_unique_output_path(self, base_path: str) -> str:
         """
         Generate a unique output path by adding a counter if file already exists.
@@ -496,81 +606,216 @@ class MarkdownToPPTX:
         Returns:
             str: A unique output path
         """
-        path = Path(base_path)
-        counter = 1
-        new_path = path
-        
-        while new_path.exists():
-            # Split filename and extension
-            name = path.stem
-            ext = path.suffix
-            # Create new filename with counter
-            new_name = f"{name}({counter}){ext}"
-            new_path = path.parent / new_name
-            counter += 1
-            
-        return str(new_path)
+        # One directory listing instead of an exists() probe per counter value.
+        # The path is not reserved; convert() uses reserve_output_path() for that.
+        return next_free_path(base_path)
 
-    def convert(self, input_file_path: str, output_dir: str = "./output") -> None:
+    def convert(self, input_file_path: str, output_dir: str = "./output", backend: str = "pptx",
+                spool: bool = False, naming: str = "counter", limits: Optional[ConversionLimits] = None,
+                cancel: Optional[CancellationToken] = None) -> None:
         """
         Convert markdown file to PPTX presentation.
         
         Args:
             input_file_path (str): Path to the input markdown file
             output_dir (str): Directory to save the output presentation
+            backend (str): 'pptx' renders through python-pptx (default);
+            'native' writes slide XML directly with NativeDeckWriter
+            spool (bool): With the native backend, write each finished slide straight
+            into the output package instead of holding it in memory until save
+            naming (str): Output file naming scheme, one of 'counter' (output(n).pptx),
+            'stem', 'hash' or 'timestamp'; see reserve_output_path()
+            limits (ConversionLimits, optional): Caps on input size, slides, table cells and
+            items per slide, and an optional wall-clock/memory budget; unlimited if omitted
+            cancel (CancellationToken, optional): Token checked between slides and table rows
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}.")
+        if naming not in NAMING_SCHEMES:
+            raise ValueError(f"Unknown naming scheme '{naming}', expected one of {NAMING_SCHEMES}.")
+        if spool and backend != 'native':
+            raise ValueError("spool=True requires backend='native'.")
+        metrics = self.metrics
+        metrics.in_progress.inc()
+        self.guard = ConversionGuard(limits, cancel)
+        try:
+            self._convert(input_file_path, output_dir, backend, spool, naming)
+        finally:
+            self.guard = ConversionGuard()
+            metrics.in_progress.dec()
+
+    def _render_slides(self, renderer, slides_data: Iterable[dict]) -> int:
+        """
+        Render parsed slides, applying the slide and per-slide item caps.
+        
+        Args:
+            renderer: The converter itself or a NativeDeckWriter
+            slides_data (Iterable[dict]): Parsed slide dictionaries
+            
+        Returns:
+            int: Number of slides created
+        """
+        guard = self.guard
+        for i, slide_data in enumerate(slides_data):
+            content = guard.limit_items(slide_data['content'])
+            # Check if this is the first # header to create a title slide
+            if i == 0 and slide_data['title']:
+                # Create title slide for the first main header
+                if not guard.allow_slide():
+                    break
+                renderer.create_title_slide(slide_data['title'])
+            
+                # If this slide has content, create a content slide too
+                if content:
+                    if not guard.allow_slide():
+                        break
+                    renderer.create_content_slide(slide_data['title'], content)
+            else:
+                if not guard.allow_slide():
+                    break
+                renderer.create_content_slide(slide_data['title'], content)
+        return guard.slides
+
+    def _convert(self, input_file_path: str, output_dir: str, backend: str, spool: bool,
+                 naming: str) -> None:
+        """
+        Conversion body of convert(), recording metrics as it goes and
+        enforcing the job's limits through self.guard.
+        
+        Args:
+            input_file_path (str): Path to the input markdown file
+            output_dir (str): Directory to save the output presentation
+            backend (str): Rendering backend, see convert()
+            spool (bool): Spool finished slides to disk, see convert()
+            naming (str): Output file naming scheme, see convert()
         """
+        metrics = self.metrics
+        guard = self.guard
+
         # Ensure output directory exists
         os.makedirs(output_dir, exist_ok=True)
         
         # Read markdown file
         try:
-            with open(input_file_path, 'r', encoding='utf-8') as f:
-                markdown_content = f.read()
+            markdown_content = guard.read_input(input_file_path)
+        except ConversionAborted as e:
+            print(f"Error: {e}")
+            metrics.failures.inc()
+            metrics.log_conversion('error', input=input_file_path, stage='read', error=type(e).__name__)
+            return
         except FileNotFoundError:
             print(f"Error: Input file '{input_file_path}' not found.")
+            metrics.failures.inc()
+            metrics.log_conversion('error', input=input_file_path, stage='read', error='not_found')
             return
         except Exception as e:
             print(f"Error reading file: {e}")
+            metrics.failures.inc()
+            metrics.log_conversion('error', input=input_file_path, stage='read', error=type(e).__name__)
             return
+        # Size on disk; measuring the decoded text would copy the whole input
+        input_bytes = os.path.getsize(input_file_path)
+        metrics.input_bytes.observe(input_bytes)
         
-        # Parse markdown content
-        slides_data = self.parse_markdown(markdown_content)
+        # Parse markdown content. When spooling, slides are parsed lazily as they
+        # are rendered so the parsed deck is never held in memory as a whole;
+        # parse time is then mostly counted as render time.
+        started = time.perf_counter()
+        try:
+            slides_iter = guard.iter_slides(self.iter_slides(markdown_content))
+            if spool:
+                first_slide = next(slides_iter, None)
+                slides_data = itertools.chain([first_slide], slides_iter) if first_slide else []
+            else:
+                slides_data = list(slides_iter)
+        except ConversionAborted as e:
+            print(f"Error: {e}")
+            metrics.failures.inc()
+            metrics.log_conversion('error', input=input_file_path, stage='parse', error=type(e).__name__)
+            return
+        except Exception as e:
+            # Unexpected errors propagate, but are still counted and logged
+            metrics.failures.inc()
+            metrics.log_conversion('error', input=input_file_path, stage='parse', error=type(e).__name__)
+            raise
+        parse_seconds = time.perf_counter() - started
+        metrics.parse_seconds.observe(parse_seconds)
         
         if not slides_data:
             print("Warning: No valid slide data found in markdown file.")
+            metrics.failures.inc()
+            metrics.log_conversion('error', input=input_file_path, stage='parse', error='no_slides')
             return
         
         # Create slides
-        first_header_slide = True
-        for i, slide_data in enumerate(slides_data):
-            # Check if this is the first # header to create a title slide
-            if first_header_slide and slides_data[0]['title']:
-                # Create title slide for the first main header
-                self.create_title_slide(slide_data['title'])
-                first_header_slide = False
-                
-                # If this slide has content, create a content slide too
-                if slide_data['content']:
-                    self.create_content_slide(slide_data['title'], slide_data['content'])
-            else:
-                self.create_content_slide(slide_data['title'], slide_data['content'])
+        started = time.perf_counter()
+        renderer = self
+        try:
+            try:
+                if backend == 'native':
+                    renderer = NativeDeckWriter(self, spool_dir=output_dir if spool else None)
+                slide_count = self._render_slides(renderer, slides_data)
+            except ConversionAborted as e:
+                print(f"Error: {e}")
+                metrics.failures.inc()
+                stage = 'cancel' if isinstance(e, ConversionCancelled) else 'render'
+                metrics.log_conversion('error', input=input_file_path, stage=stage, error=type(e).__name__)
+                return
+            except Exception as e:
+                metrics.failures.inc()
+                metrics.log_conversion('error', input=input_file_path, stage='render', error=type(e).__name__)
+                raise
+            if guard.truncated:
+                print(f"Warning: Output truncated to fit the limits ({', '.join(guard.truncated)}).")
+            render_seconds = time.perf_counter() - started
+            metrics.render_seconds.observe(render_seconds)
         
-        # Generate unique output path
-        output_filename = "output.pptx"
-        output_path = os.path.join(output_dir, output_filename)
-        unique_output_path = self.get_unique_output_path(output_path)
+            # Claim a unique output path; concurrent converters never get the same one
+            try:
+                unique_output_path = reserve_output_path(
+                    output_dir, naming, input_path=input_file_path, content=markdown_content,
+                    salt=self.template_path or ''
+                )
+            except Exception as e:
+                metrics.failures.inc()
+                metrics.log_conversion('error', input=input_file_path, stage='save', error=type(e).__name__)
+                raise
         
-        # Save presentation
-        try:
-            self.presentation.save(unique_output_path)
-            print(f"Presentation saved to {unique_output_path}")
-        except Exception as e:
-            print(f"Error saving presentation: {e}")
+            # Save presentation to a temporary file and rename it into place
+            started = time.perf_counter()
+            try:
+                write_atomically(renderer.save, unique_output_path)
+                print(f"Presentation saved to {unique_output_path}")
+            except Exception as e:
+                release_output_path(unique_output_path)
+                print(f"Error saving presentation: {e}")
+                metrics.failures.inc()
+                metrics.log_conversion('error', input=input_file_path, stage='save', error=type(e).__name__)
+                return
+            save_seconds = time.perf_counter() - started
+            metrics.save_seconds.observe(save_seconds)
+            output_bytes = os.path.getsize(unique_output_path)
+            metrics.output_bytes.observe(output_bytes)
+            metrics.conversions.inc()
+            metrics.log_conversion(
+                'ok', input=input_file_path, output=unique_output_path,
+                slides=slide_count, backend=backend, input_bytes=input_bytes, output_bytes=output_bytes,
+                parse_seconds=parse_seconds, render_seconds=render_seconds, save_seconds=save_seconds,
+                truncated=','.join(guard.truncated) or None
+            )
+        finally:
+            # Removes a spool file left behind by a failed conversion
+            if renderer is not self:
+                renderer.discard()
 
 def main():
     """
     Main function to run the markdown to PPTX converter.
     """
+    # Structured metric log lines go through the logging config, if present
+    if os.path.exists("./config/logging.conf"):
+        logging.config.fileConfig("./config/logging.conf", disable_existing_loggers=False)
+
     # Create converter instance
     converter = MarkdownToPPTX("./assets/templates/template.pptx")
     
@@ -0,0 +1,326 @@
+# limits.py
+
+import os
+import sys
+import threading
+import time
+from typing import Iterable, Iterator, List, Optional
+
+from MarkdownToPPTX.modules.tables import Table
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# What to do when a cap is hit: raise LimitExceeded, or drop what is over the cap and carry on
+LIMIT_POLICIES = ('error', 'truncate')
+
+# Markdown lines parsed between cancellation, deadline and memory checks
+CHECK_INTERVAL_LINES = 1024
+
+
+class ConversionAborted(Exception):
+    """
+    Base class for conversions stopped by a limit, a budget or a cancellation.
+    """
+
+
+class LimitExceeded(ConversionAborted):
+    """
+    An input exceeded one of the configured caps.
+    """
+
+    def __init__(self, limit: str, value: int, maximum: int):
+        super().__init__(f"{limit} exceeds the limit: {value} > {maximum}")
+        self.limit = limit
+        self.value = value
+        self.maximum = maximum
+
+
+class BudgetExceeded(ConversionAborted):
+    """
+    A job ran out of its wall-clock or memory budget.
+    """
+
+
+class ConversionCancelled(ConversionAborted):
+    """
+    A job was cancelled through its CancellationToken.
+    """
+
+
+class CancellationToken:
+    """
+    Thread-safe flag for cancelling a running conversion from another thread.
+    The converter checks it while parsing, between slides and between table rows.
+    """
+    __slots__ = ('_event', 'reason')
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.reason = None
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        self.reason = reason
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise ConversionCancelled(self.reason)
+
+
+class ConversionLimits:
+    """
+    Per-conversion resource caps. Every cap is optional; None means unlimited.
+
+    Args:
+        max_input_bytes (int, optional): Size of the markdown file
+        max_slides (int, optional): Slides rendered, title slide included
+        max_table_cells (int, optional): Rows x columns of a single table
+        max_items_per_slide (int, optional): Headers, bullets, paragraphs and tables on one slide
+        policy (str): 'error' fails the conversion when a cap is hit; 'truncate'
+        drops the excess (trailing input, slides, table rows or items) and converts the rest
+        timeout_seconds (float, optional): Wall-clock budget for the whole job
+        max_memory_bytes (int, optional): Growth of the process RSS allowed during the job
+    """
+    __slots__ = ('max_input_bytes', 'max_slides', 'max_table_cells', 'max_items_per_slide',
+                 'policy', 'timeout_seconds', 'max_memory_bytes')
+
+    def __init__(self, max_input_bytes: Optional[int] = None, max_slides: Optional[int] = None,
+                 max_table_cells: Optional[int] = None, max_items_per_slide: Optional[int] = None,
+                 policy: str = 'error', timeout_seconds: Optional[float] = None,
+                 max_memory_bytes: Optional[int] = None):
+        if policy not in LIMIT_POLICIES:
+            raise ValueError(f"Unknown limit policy '{policy}', expected one of {LIMIT_POLICIES}.")
+        self.max_input_bytes = max_input_bytes
+        self.max_slides = max_slides
+        self.max_table_cells = max_table_cells
+        self.max_items_per_slide = max_items_per_slide
+        self.policy = policy
+        self.timeout_seconds = timeout_seconds
+        self.max_memory_bytes = max_memory_bytes
+
+
+def current_rss_bytes() -> Optional[int]:
+    """
+    Resident set size of this process, or None where it cannot be measured.
+    Reads /proc on Linux; elsewhere falls back to the peak RSS from getrusage.
+    """
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # KiB on Linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class ConversionGuard:
+    """
+    Applies ConversionLimits and a CancellationToken to one conversion job.
+
+    The converter creates one per convert() call. check() is cheap (a flag
+    and a clock read) and runs between slides and table rows; the RSS is only
+    sampled once per slide. While parsing, tick() runs both checks every
+    CHECK_INTERVAL_LINES lines, and the item and table cell caps are applied
+    as the slide is built. Truncations are recorded in `truncated`.
+
+    Args:
+        limits (ConversionLimits, optional): Caps and budgets, unlimited if omitted
+        cancel (CancellationToken, optional): Token to observe
+    """
+
+    def __init__(self, limits: Optional[ConversionLimits] = None, cancel: Optional[CancellationToken] = None):
+        self.limits = limits or ConversionLimits()
+        self.cancel = cancel
+        self.truncated: List[str] = []
+        self.slides = 0
+        timeout = self.limits.timeout_seconds
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self.rss_baseline = current_rss_bytes() if self.limits.max_memory_bytes is not None else None
+        self._lines_until_check = CHECK_INTERVAL_LINES
+
+    @property
+    def truncating(self) -> bool:
+        return self.limits.policy == 'truncate'
+
+    def _truncate(self, what: str) -> None:
+        if what not in self.truncated:
+            self.truncated.append(what)
+
+    def check(self) -> None:
+        """
+        Raise if the job was cancelled or is past its deadline.
+        """
+        if self.cancel is not None:
+            self.cancel.raise_if_cancelled()
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise BudgetExceeded(f"wall-clock budget of {self.limits.timeout_seconds}s exceeded")
+
+    def check_memory(self) -> None:
+        """
+        Raise if the process RSS grew by more than the memory budget since the job started.
+        """
+        if self.rss_baseline is None:
+            return
+        rss = current_rss_bytes()
+        if rss is not None and rss - self.rss_baseline > self.limits.max_memory_bytes:
+            raise BudgetExceeded(
+                f"memory budget of {self.limits.max_memory_bytes} bytes exceeded "
+                f"({rss - self.rss_baseline} bytes used)"
+            )
+
+    def tick(self) -> None:
+        """
+        Account for one parsed markdown line, running check() and check_memory()
+        every CHECK_INTERVAL_LINES lines.
+        """
+        self._lines_until_check -= 1
+        if self._lines_until_check <= 0:
+            self._lines_until_check = CHECK_INTERVAL_LINES
+            self.check()
+            self.check_memory()
+
+    def read_input(self, path: str) -> str:
+        """
+        Read the markdown file, enforcing the input size cap before reading.
+        When truncating, only the first max_input_bytes are read, cut back to the last full line.
+
+        Args:
+            path (str): Path to the markdown file
+
+        Returns:
+            str: The (possibly truncated) markdown content
+        """
+        maximum = self.limits.max_input_bytes
+        if maximum is None:
+            with open(path, 'r', encoding='utf-8') as f:
+                return f.read()
+        size = os.path.getsize(path)
+        if size <= maximum:
+            with open(path, 'r', encoding='utf-8') as f:
+                return f.read()
+        if not self.truncating:
+            raise LimitExceeded('input bytes', size, maximum)
+        self._truncate('input')
+        with open(path, 'rb') as f:
+            data = f.read(maximum)
+        newline = data.rfind(b'\n')
+        if newline != -1:
+            data = data[:newline + 1]
+        # The cut may land inside a multi-byte character
+        return data.decode('utf-8', errors='ignore')
+
+    def iter_slides(self, slides: Iterable[dict]) -> Iterator[dict]:
+        """
+        Pass parsed slides through, checking cancellation and the deadline between
+        them. Parsing stops once more slides than max_slides were seen, since each
+        parsed slide renders to at least one slide.
+
+        Args:
+            slides (Iterable[dict]): Parsed slide dictionaries
+
+        Yields:
+            dict: The same slide dictionaries
+        """
+        maximum = self.limits.max_slides
+        for parsed, slide in enumerate(slides, 1):
+            self.check()
+            if maximum is not None and parsed > maximum:
+                if not self.truncating:
+                    raise LimitExceeded('slide count', parsed, maximum)
+                self._truncate('slides')
+                return
+            yield slide
+
+    def allow_slide(self) -> bool:
+        """
+        Account for one more rendered slide. Called before each slide is created.
+
+        Returns:
+            bool: False if the slide cap is reached and the rest should be dropped
+        """
+        self.check()
+        self.check_memory()
+        maximum = self.limits.max_slides
+        if maximum is not None and self.slides >= maximum:
+            if not self.truncating:
+                raise LimitExceeded('slide count', self.slides + 1, maximum)
+            self._truncate('slides')
+            return False
+        self.slides += 1
+        return True
+
+    def limit_items(self, content: List[dict]) -> List[dict]:
+        """
+        Apply the per-slide item cap to a slide's content list.
+
+        Args:
+            content (List[dict]): Content items of one slide
+
+        Returns:
+            List[dict]: The content, cut to max_items_per_slide when truncating
+        """
+        maximum = self.limits.max_items_per_slide
+        if maximum is None or len(content) <= maximum:
+            return content
+        if not self.truncating:
+            raise LimitExceeded('items per slide', len(content), maximum)
+        self._truncate('items')
+        return content[:maximum]
+
+    def limit_parsed_items(self, slide: dict) -> None:
+        """
+        Apply the per-slide item cap to a slide while it is being parsed, so an
+        oversized slide fails (or stops growing) before the rest of it is read.
+
+        Headers are placed before the other content once the slide is complete,
+        so keeping up to max_items_per_slide of each keeps every item that
+        limit_items() would keep.
+
+        Args:
+            slide (dict): Slide dictionary with 'headers' and 'content' lists, cut in place
+        """
+        maximum = self.limits.max_items_per_slide
+        if maximum is None:
+            return
+        items = len(slide['headers']) + len(slide['content'])
+        if items <= maximum:
+            return
+        if not self.truncating:
+            raise LimitExceeded('items per slide', items, maximum)
+        for key in ('headers', 'content'):
+            if len(slide[key]) > maximum:
+                self._truncate('items')
+                del slide[key][maximum:]
+
+    def limit_table(self, table: Table) -> Table:
+        """
+        Apply the table cell cap. When truncating, trailing rows are dropped
+        (and columns, if a single row is already over the cap).
+
+        Args:
+            table (Table): Parsed table
+
+        Returns:
+            Table: The table to render
+        """
+        maximum = self.limits.max_table_cells
+        cells = table.n_rows * table.n_cols
+        if maximum is None or cells <= maximum:
+            return table
+        if not self.truncating:
+            raise LimitExceeded('table cells', cells, maximum)
+        self._truncate('table cells')
+        if table.n_cols > maximum:
+            return table.head(1, maximum)
+        return table.head(maximum // table.n_cols, table.n_cols)
@@ -0,0 +1,343 @@
+# merge.py
+
+import argparse
+import hashlib
+import posixpath
+import re
+import zipfile
+from typing import Dict, List, Optional, Set, Tuple
+
+from lxml import etree
+
+from MarkdownToPPTX.modules.opc import (
+    CT_SLIDE_LAYOUT, CT_SLIDE_MASTER, NS_P, NS_R, RT_NOTES_SLIDE, RT_SLIDE, RT_SLIDE_LAYOUT, RT_SLIDE_MASTER,
+    PackageReader, Relationship, rels_path, serialize_content_types, serialize_rels, slide_id_list,
+)
+
+
+# Relationship types not carried over from merged slides. Notes slides need a
+# notes master registered in the presentation and are not produced by the converter.
+SKIPPED_RELTYPES = {RT_NOTES_SLIDE}
+
+# Parts that are rewritten rather than copied from the first deck
+_CONTENT_TYPES = "[Content_Types].xml"
+
+
+class DeckMerger:
+    """
+    Concatenate .pptx decks at the zip/XML level.
+
+    The first deck is copied as the base package. Slides of the following decks
+    are appended with their relationship targets copied across. A slide master
+    is de-duplicated as one unit with its layouts and theme: decks built from
+    the same template share one master, and any difference anywhere in the unit
+    copies the whole master, so layouts are never shared between masters.
+    Media are de-duplicated by content.
+    """
+
+    def __init__(self, output_path: str, compression: int = zipfile.ZIP_DEFLATED):
+        """
+        Args:
+            output_path (str): Path of the merged .pptx
+            compression (int): zipfile compression method for written parts
+        """
+        self.output_path = output_path
+        self.compression = compression
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._names: Set[str] = set()
+        self._defaults: Dict[str, str] = {}
+        self._overrides: Dict[str, str] = {}
+        # (content type, sha1) -> part name, for media parts
+        self._blobs: Dict[Tuple[str, str], str] = {}
+        # master unit key -> (master part name, its layout part names in relationship order)
+        self._masters: Dict[str, Tuple[str, List[str]]] = {}
+        # next free number per (directory, stem, extension)
+        self._counters: Dict[Tuple[str, str, str], int] = {}
+        self._presentation = ""
+        self._presentation_root = None
+        self._presentation_rels: List[Relationship] = []
+        self._used_rIds: Optional[Set[str]] = None
+        self._next_rId = 1
+        self._next_slide_id = 256
+        self._next_master_id = 2147483648
+        self._slide_count = 0
+
+    def merge(self, input_paths: List[str]) -> str:
+        """
+        Merge the given decks, in order, into the output file.
+
+        Args:
+            input_paths (List[str]): Paths of the .pptx files to merge
+
+        Returns:
+            str: The output path
+        """
+        if not input_paths:
+            raise ValueError("At least one input presentation is required.")
+        with zipfile.ZipFile(self.output_path, "w", self.compression) as self._zip:
+            with PackageReader(input_paths[0]) as base:
+                self._add_base(base)
+            for path in input_paths[1:]:
+                with PackageReader(path) as package:
+                    self._append_slides(package)
+            self._write_presentation_parts()
+        self._zip = None
+        return self.output_path
+
+    # ---------------------------------------------------------------- base deck
+
+    def _add_base(self, base: PackageReader) -> None:
+        self._presentation = base.main_part()
+        self._defaults = dict(base.defaults)
+        self._overrides = dict(base.overrides)
+        self._presentation_rels = list(base.rels(self._presentation))
+        self._presentation_root = etree.fromstring(base.read(self._presentation))
+        self._slide_count = len(base.slide_parts())
+
+        held_back = {_CONTENT_TYPES, self._presentation, rels_path(self._presentation), "docProps/app.xml"}
+        for info in base.zip.infolist():
+            self._names.add(info.filename)
+            if info.filename in held_back:
+                continue
+            self._copy_stream(base, info)
+
+        for name in base.names:
+            if name.startswith("ppt/media/"):
+                self._blobs[(base.content_type(name), _sha1(base.read(name)))] = name
+        for master in self._master_parts(base):
+            self._masters[self._master_key(base, master)] = (master, _master_layouts(base, master))
+
+        for el in self._presentation_root.iter(f"{{{NS_P}}}sldId"):
+            self._next_slide_id = max(self._next_slide_id, int(el.get("id")) + 1)
+        for master in self._master_parts(base):
+            for el in etree.fromstring(base.read(master)).iter(f"{{{NS_P}}}sldLayoutId"):
+                self._next_master_id = max(self._next_master_id, int(el.get("id")) + 1)
+        for el in self._presentation_root.iter(f"{{{NS_P}}}sldMasterId"):
+            self._next_master_id = max(self._next_master_id, int(el.get("id")) + 1)
+
+        self._app = base.read("docProps/app.xml") if "docProps/app.xml" in base.names else None
+
+    def _copy_stream(self, package: PackageReader, info: zipfile.ZipInfo) -> None:
+        with package.zip.open(info) as src, self._zip.open(_new_info(info.filename, info.compress_type), "w") as dst:
+            while True:
+                chunk = src.read(1 << 16)
+                if not chunk:
+                    break
+                dst.write(chunk)
+
+    def _master_parts(self, package: PackageReader) -> List[str]:
+        return [rel.target for rel in package.rels(package.main_part()) if rel.reltype == RT_SLIDE_MASTER]
+
+    # ------------------------------------------------------------ other decks
+
+    def _append_slides(self, package: PackageReader) -> None:
+        copied: Dict[str, str] = {}
+        for slide in package.slide_parts():
+            new_slide = self._copy_part(package, slide, copied)
+            rId = self._new_presentation_rId()
+            self._presentation_rels.append(Relationship(rId, RT_SLIDE, new_slide, False))
+            _p_subelement(slide_id_list(self._presentation_root), "sldId", id=str(self._next_slide_id), rId=rId)
+            self._next_slide_id += 1
+            self._slide_count += 1
+
+    def _copy_part(self, package: PackageReader, part: str, copied: Dict[str, str]) -> str:
+        """
+        Copy a part and, recursively, the parts it references. Returns the
+        part name in the output package.
+        """
+        if part in copied:
+            return copied[part]
+        ct = package.content_type(part)
+
+        # A slide's layout is shared or copied together with its master. Layouts
+        # reached while their master is being copied find it in `copied` and
+        # are copied as they are
+        master = None
+        if ct == CT_SLIDE_MASTER:
+            master = part
+        elif ct == CT_SLIDE_LAYOUT:
+            master = next((rel.target for rel in package.rels(part) if rel.reltype == RT_SLIDE_MASTER), None)
+        if master is not None and master not in copied:
+            self._copy_master(package, master, copied)
+            return copied[part]
+        return self._copy_new_part(package, part, ct, copied)
+
+    def _copy_new_part(self, package: PackageReader, part: str, ct: Optional[str], copied: Dict[str, str]) -> str:
+        data = package.read(part)
+        rels = [rel for rel in package.rels(part) if rel.reltype not in SKIPPED_RELTYPES]
+        media = not rels and part.startswith("ppt/media/")
+        if media:
+            blob_key = (ct, _sha1(data))
+            if blob_key in self._blobs:
+                copied[part] = self._blobs[blob_key]
+                return copied[part]
+
+        # Reserve the name first so reference cycles (master <-> layout) terminate
+        new_part = self._allocate(part)
+        copied[part] = new_part
+        new_rels = [
+            rel if rel.external else rel._replace(target=self._copy_part(package, rel.target, copied))
+            for rel in rels
+        ]
+
+        if ct == CT_SLIDE_MASTER:
+            data = self._renumber_layout_ids(data)
+            rId = self._new_presentation_rId()
+            self._presentation_rels.append(Relationship(rId, RT_SLIDE_MASTER, new_part, False))
+            master_list = self._presentation_root.find(f"{{{NS_P}}}sldMasterIdLst")
+            _p_subelement(master_list, "sldMasterId", id=str(self._next_master_id), rId=rId)
+            self._next_master_id += 1
+
+        self._write(new_part, data)
+        if new_rels:
+            self._write(rels_path(new_part), serialize_rels(new_rels, new_part))
+        if media:
+            self._blobs[blob_key] = new_part
+
+        ext = posixpath.splitext(new_part)[1].lstrip(".").lower()
+        if ct is not None and self._defaults.get(ext) != ct:
+            if ext not in self._defaults and ext in package.defaults and package.defaults[ext] == ct:
+                self._defaults[ext] = ct
+            else:
+                self._overrides[new_part] = ct
+        return new_part
+
+    def _copy_master(self, package: PackageReader, master: str, copied: Dict[str, str]) -> None:
+        """
+        Map a master and its layouts onto an identical unit already in the
+        output, or copy the master with all its layouts and theme.
+        """
+        key = self._master_key(package, master)
+        layouts = _master_layouts(package, master)
+        if key in self._masters:
+            # Identical units list their layouts in the same order
+            copied[master], new_layouts = self._masters[key]
+            copied.update(zip(layouts, new_layouts))
+            return
+        new_master = self._copy_new_part(package, master, CT_SLIDE_MASTER, copied)
+        self._masters[key] = (new_master, [copied[layout] for layout in layouts])
+
+    def _master_key(self, package: PackageReader, master: str) -> str:
+        """
+        Identify a master unit by the content of every part reachable from the
+        master (layouts, theme, images) and the relationships between them.
+        """
+        digest = hashlib.sha1()
+        visited: Dict[str, int] = {}
+        pending = [master]
+        while pending:
+            part = pending.pop()
+            if part in visited:
+                continue
+            visited[part] = len(visited)
+            digest.update(package.read(part))
+            for rel in package.rels(part):
+                digest.update(f"\0{rel.rId}\0{rel.reltype}\0".encode("utf-8"))
+                if rel.external:
+                    digest.update(rel.target.encode("utf-8"))
+                elif rel.target in visited:
+                    # Back references (layout -> master) by visiting order, not by name
+                    digest.update(b"#%d" % visited[rel.target])
+                else:
+                    pending.append(rel.target)
+        return digest.hexdigest()
+
+    def _renumber_layout_ids(self, master_xml: bytes) -> bytes:
+        root = etree.fromstring(master_xml)
+        for el in root.iter(f"{{{NS_P}}}sldLayoutId"):
+            el.set("id", str(self._next_master_id))
+            self._next_master_id += 1
+        return etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+    # ----------------------------------------------------------------- output
+
+    def _allocate(self, part: str) -> str:
+        directory, filename = posixpath.split(part)
+        stem, ext = posixpath.splitext(filename)
+        stem = stem.rstrip("0123456789")
+        key = (directory, stem, ext)
+        n = self._counters.get(key, 1)
+        while True:
+            name = posixpath.join(directory, f"{stem}{n}{ext}")
+            n += 1
+            if name not in self._names:
+                break
+        self._counters[key] = n
+        self._names.add(name)
+        return name
+
+    def _write(self, part: str, data: bytes) -> None:
+        self._names.add(part)
+        self._zip.writestr(_new_info(part, self.compression), data)
+
+    def _new_presentation_rId(self) -> str:
+        if self._used_rIds is None:
+            self._used_rIds = {rel.rId for rel in self._presentation_rels}
+        while f"rId{self._next_rId}" in self._used_rIds:
+            self._next_rId += 1
+        rId = f"rId{self._next_rId}"
+        self._used_rIds.add(rId)
+        return rId
+
+    def _write_presentation_parts(self) -> None:
+        self._write(
+            self._presentation,
+            etree.tostring(self._presentation_root, xml_declaration=True, encoding="UTF-8", standalone=True),
+        )
+        self._write(rels_path(self._presentation), serialize_rels(self._presentation_rels, self._presentation))
+        if self._app is not None:
+            app = re.sub(rb"<Slides>\d+</Slides>", b"<Slides>%d</Slides>" % self._slide_count, self._app)
+            self._write("docProps/app.xml", app)
+        self._write(_CONTENT_TYPES, serialize_content_types(self._defaults, self._overrides))
+
+
+def _master_layouts(package: PackageReader, master: str) -> List[str]:
+    return [rel.target for rel in package.rels(master) if rel.reltype == RT_SLIDE_LAYOUT]
+
+
+def _sha1(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def _new_info(name: str, compression: int) -> zipfile.ZipInfo:
+    info = zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0))
+    info.compress_type = compression
+    return info
+
+
+def _p_subelement(parent, tag: str, id: str, rId: str):
+    el = etree.SubElement(parent, f"{{{NS_P}}}{tag}")
+    el.set("id", id)
+    el.set(f"{{{NS_R}}}id", rId)
+    return el
+
+
+def merge_presentations(input_paths: List[str], output_path: str) -> str:
+    """
+    Merge several .pptx decks produced by the converter into one, without re-rendering.
+
+    Args:
+        input_paths (List[str]): Decks to merge, in slide order
+        output_path (str): Path of the merged presentation
+
+    Returns:
+        str: The output path
+    """
+    return DeckMerger(output_path).merge(input_paths)
+
+
+def main():
+    """
+    Command line entry point: merge decks into one presentation.
+    """
+    parser = argparse.ArgumentParser(description="Merge .pptx decks without re-rendering them.")
+    parser.add_argument("output", help="merged .pptx to write")
+    parser.add_argument("inputs", nargs="+", help=".pptx decks to merge, in order")
+    args = parser.parse_args()
+
+    output_path = merge_presentations(args.inputs, args.output)
+    print(f"Presentation saved to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+# metrics.py
+
+import logging
+import os
+import re
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from MarkdownToPPTX.modules.naming import temporary_path
+
+
+logger = logging.getLogger(__name__)
+
+# Default histogram buckets (seconds / bytes)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+
+# Log values that must be quoted: empty, or holding whitespace, '=', '"', '\\' or control characters
+_NEEDS_QUOTES = re.compile(r'^$|[\s="\\\x00-\x1f\x7f-\x9f]')
+# Characters escaped inside quotes, so a value can never end the line or the quoted string
+_ESCAPED = re.compile(r'["\\]|[^\S ]|[\x00-\x1f\x7f-\x9f]')
+_ESCAPES = {'"': '\\"', '\\': '\\\\', '\n': '\\n', '\r': '\\r', '\t': '\\t'}
+
+
+def _sample_value(value: float) -> str:
+    # Full precision; ':g' keeps only 6 significant digits (1048576 -> 1.04858e+06)
+    return repr(float(value))
+
+
+def _log_value(value: str) -> str:
+    if not _NEEDS_QUOTES.search(value):
+        return value
+    escaped = _ESCAPED.sub(
+        lambda m: _ESCAPES.get(m.group(), f"\\u{ord(m.group()):04x}"), value
+    )
+    return f'"{escaped}"'
+
+
+class Counter:
+    """
+    Monotonically increasing counter.
+    """
+    __slots__ = ('name', 'help', 'value')
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.help}",
+            f"# TYPE {self.name} counter",
+            f"{self.name} {self.value}",
+        ]
+
+
+class Gauge:
+    """
+    Value that can go up and down.
+    """
+    __slots__ = ('name', 'help', 'value')
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self.value -= amount
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.help}",
+            f"# TYPE {self.name} gauge",
+            f"{self.name} {self.value}",
+        ]
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram. Bucket counts are pre-allocated, so observe()
+    is a bisect plus two additions; cumulative counts are computed on render.
+    """
+    __slots__ = ('name', 'help', 'buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float]):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        # one extra slot for +Inf
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.help}",
+            f"# TYPE {self.name} histogram",
+        ]
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{{le="{_sample_value(bound)}"}} {cumulative}')
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {self.count}')
+        lines.append(f"{self.name}_sum {_sample_value(self.sum)}")
+        lines.append(f"{self.name}_count {self.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Registry holding the converter's counters, histograms and gauges.
+
+    All metrics are created up front and exposed as attributes, so the
+    conversion hot path only touches plain attributes.
+    """
+
+    def __init__(self, prefix: str = "markdowntopptx"):
+        p = prefix
+        # Counters
+        self.conversions = Counter(f"{p}_conversions_total", "Completed conversions.")
+        self.failures = Counter(f"{p}_failures_total", "Failed conversions.")
+        self.slides = Counter(f"{p}_slides_total", "Slides rendered.")
+        self.tables = Counter(f"{p}_tables_total", "Tables rendered.")
+        # Histograms
+        self.parse_seconds = Histogram(f"{p}_parse_seconds", "Markdown parse latency.", LATENCY_BUCKETS)
+        self.render_seconds = Histogram(f"{p}_render_seconds", "Slide render latency.", LATENCY_BUCKETS)
+        self.save_seconds = Histogram(f"{p}_save_seconds", "Presentation save latency.", LATENCY_BUCKETS)
+        self.input_bytes = Histogram(f"{p}_input_bytes", "Markdown input size.", SIZE_BUCKETS)
+        self.output_bytes = Histogram(f"{p}_output_bytes", "PPTX output size.", SIZE_BUCKETS)
+        # Gauges
+        self.in_progress = Gauge(f"{p}_conversions_in_progress", "Conversions currently running in convert().")
+
+        self._metrics = [
+            self.conversions, self.failures, self.slides, self.tables,
+            self.parse_seconds, self.render_seconds, self.save_seconds,
+            self.input_bytes, self.output_bytes,
+            self.in_progress,
+        ]
+
+    def render_prometheus(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition text
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """
+        Atomically write the exposition text to a file, e.g. for the
+        node_exporter textfile collector. The file gets the usual permissions
+        (not mkstemp's 0600), so a collector running as another user can read it.
+
+        Args:
+            path (str): Destination .prom file path
+        """
+        tmp_path = temporary_path(os.path.dirname(os.path.abspath(path)))
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(self.render_prometheus())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def log_conversion(self, status: str, **fields) -> None:
+        """
+        Emit one structured (key=value) log line for a conversion.
+
+        Args:
+            status (str): 'ok' or 'error'
+            **fields: Additional key/value pairs to log; None values are left out
+        """
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        parts = [f"event=conversion status={status}"]
+        for key, value in fields.items():
+            if value is None:
+                continue
+            if isinstance(value, float):
+                value = f"{value:.6f}"
+            elif isinstance(value, str):
+                value = _log_value(value)
+            parts.append(f"{key}={value}")
+        logger.info(" ".join(parts))
+
+    def snapshot(self) -> Dict[str, Tuple]:
+        """
+        Return current raw values keyed by metric name (useful for tests).
+
+        Returns:
+            Dict[str, Tuple]: Counters/gauges as (value,), histograms as (count, sum)
+        """
+        result = {}
+        for metric in self._metrics:
+            if isinstance(metric, Histogram):
+                result[metric.name] = (metric.count, metric.sum)
+            else:
+                result[metric.name] = (metric.value,)
+        return result
+
+
+# Process-wide default registry
+default_registry = MetricsRegistry()
+
+
+def serve_metrics(registry: Optional[MetricsRegistry] = None, host: str = "127.0.0.1",
+                  port: int = 9464) -> ThreadingHTTPServer:
+    """
+    Serve the registry on /metrics from a daemon thread.
+
+    Args:
+        registry (MetricsRegistry, optional): Registry to expose, defaults to the process-wide one
+        host (str): Bind address
+        port (int): Bind port
+
+    Returns:
+        ThreadingHTTPServer: The running server; call shutdown() to stop it
+    """
+    registry = registry or default_registry
+
+    class _MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug(format, *args)
+
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
@@ -0,0 +1,196 @@
+# naming.py
+
+import hashlib
+import itertools
+import os
+import re
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+
+# Output naming schemes accepted by reserve_output_path()
+NAMING_SCHEMES = ('counter', 'stem', 'hash', 'timestamp')
+
+# Next counter to try per base path, so repeated conversions into the same
+# directory do not rescan it
+_next_counters: Dict[str, int] = {}
+_counters_lock = threading.Lock()
+
+# Per-process sequence for the timestamp scheme
+_sequence = itertools.count(1)
+
+
+def _scan_next_counter(directory: str, name: str, ext: str) -> int:
+    """
+    Find the counter to start from with a single directory listing.
+
+    Returns 0 if `name + ext` is free, otherwise one past the highest `name(n) + ext`.
+    """
+    pattern = re.compile(re.escape(name) + r'\((\d+)\)' + re.escape(ext) + '$')
+    base_taken = False
+    highest = 0
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name == name + ext:
+                base_taken = True
+                continue
+            match = pattern.match(entry.name)
+            if match:
+                highest = max(highest, int(match.group(1)))
+    return highest + 1 if base_taken else 0
+
+
+def _counter_name(name: str, ext: str, counter: int) -> str:
+    return f"{name}{ext}" if counter == 0 else f"{name}({counter}){ext}"
+
+
+def _create_exclusive(path: str) -> bool:
+    """
+    Atomically create an empty file. Returns False if it already exists.
+    """
+    try:
+        fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+    except FileExistsError:
+        return False
+    os.close(fd)
+    return True
+
+
+def next_free_path(base_path: str) -> str:
+    """
+    Return `base_path`, or `name(n).ext` with the next free counter, without creating it.
+
+    Args:
+        base_path (str): The base output path
+
+    Returns:
+        str: A path that did not exist when the directory was listed
+    """
+    path = Path(base_path)
+    directory = str(path.parent)
+    if not os.path.isdir(directory):
+        return str(path)
+    counter = _scan_next_counter(directory, path.stem, path.suffix)
+    return str(path.parent / _counter_name(path.stem, path.suffix, counter))
+
+
+def _reserve_counter(directory: str, name: str, ext: str) -> str:
+    key = os.path.join(os.path.abspath(directory), name + ext)
+    with _counters_lock:
+        counter = _next_counters.get(key)
+    # The remembered counter is stale if the directory was emptied meanwhile
+    if counter is None or not os.path.exists(os.path.join(directory, name + ext)):
+        counter = _scan_next_counter(directory, name, ext)
+    while True:
+        path = os.path.join(directory, _counter_name(name, ext, counter))
+        counter += 1
+        if _create_exclusive(path):
+            break
+    with _counters_lock:
+        _next_counters[key] = counter
+    return path
+
+
+def reserve_output_path(output_dir: str, scheme: str = 'counter', input_path: Optional[str] = None,
+                        content: Optional[str] = None, base_name: str = 'output', ext: str = '.pptx',
+                        salt: str = '') -> str:
+    """
+    Choose an output path and claim it atomically, so concurrent converters
+    writing into the same directory never pick the same name.
+
+    Schemes:
+        counter: output.pptx, output(1).pptx, ... (the original naming)
+        stem: the input file's stem, with a counter on collision
+        hash: the input stem plus a hash of `content` and `salt`. The same input always
+        maps to the same name, and a later conversion replaces the earlier file
+        timestamp: the input stem plus a timestamp and a sequence number
+
+    For counter, stem and timestamp an empty placeholder file is created
+    exclusively (O_CREAT | O_EXCL), which makes the name ours. The directory
+    is listed once per base name per process; after that the next counter is
+    kept in memory (checked with a single stat), so naming stays O(1) however
+    many outputs exist.
+
+    Args:
+        output_dir (str): Directory the output goes to
+        scheme (str): One of NAMING_SCHEMES
+        input_path (str, optional): Input file, used for the stem
+        content (str, optional): Input content, used by the hash scheme
+        base_name (str): Name used when there is no input path, and by the counter scheme
+        ext (str): Output file extension
+        salt (str): Extra data mixed into the content hash, e.g. the template
+
+    Returns:
+        str: The reserved output path
+    """
+    if scheme not in NAMING_SCHEMES:
+        raise ValueError(f"Unknown naming scheme '{scheme}', expected one of {NAMING_SCHEMES}.")
+    stem = Path(input_path).stem if input_path else base_name
+
+    if scheme == 'counter':
+        return _reserve_counter(output_dir, base_name, ext)
+    if scheme == 'stem':
+        return _reserve_counter(output_dir, stem, ext)
+    if scheme == 'hash':
+        digest = hashlib.sha256()
+        digest.update(salt.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update((content or '').encode('utf-8'))
+        return os.path.join(output_dir, f"{stem}-{digest.hexdigest()[:16]}{ext}")
+
+    timestamp = time.strftime('%Y%m%d-%H%M%S')
+    while True:
+        path = os.path.join(output_dir, f"{stem}-{timestamp}-{next(_sequence):04d}{ext}")
+        if _create_exclusive(path):
+            return path
+
+
+def temporary_path(directory: str, suffix: str = '.tmp') -> str:
+    """
+    Return a unique hidden file name in `directory` for writing before a rename.
+    Unlike mkstemp the file is not created, so it gets the usual permissions when written.
+
+    Args:
+        directory (str): Directory for the file, normally the output's own
+        suffix (str): File name suffix
+
+    Returns:
+        str: The temporary path
+    """
+    return os.path.join(directory, f".{uuid.uuid4().hex}{suffix}")
+
+
+def write_atomically(save: Callable[[str], None], path: str) -> None:
+    """
+    Run `save` on a temporary file next to `path`, then rename it into place,
+    so readers never see a partially written output.
+
+    Args:
+        save (Callable[[str], None]): Function writing the output to the path it is given
+        path (str): Final output path
+    """
+    tmp_path = temporary_path(os.path.dirname(os.path.abspath(path)))
+    try:
+        save(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def release_output_path(path: str) -> None:
+    """
+    Remove an unused reservation (an empty placeholder) after a failed save.
+
+    Args:
+        path (str): Path returned by reserve_output_path()
+    """
+    try:
+        if os.path.getsize(path) == 0:
+            os.unlink(path)
+    except OSError:
+        pass
@@ -0,0 +1,457 @@
+# native.py
+
+import io
+import os
+import re
+import zipfile
+from typing import Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from lxml import etree
+from pptx import Presentation
+from pptx.util import Cm, Inches, Pt
+
+from MarkdownToPPTX.modules.naming import temporary_path
+from MarkdownToPPTX.modules.opc import (
+    CT_SLIDE, NS_P, NS_R, RT_SLIDE, RT_SLIDE_LAYOUT, PackageReader, Relationship, escape_control_chars,
+    rels_path, serialize_content_types, serialize_rels, slide_id_list,
+)
+from MarkdownToPPTX.modules.tables import layout_columns
+
+
+_LINE_BREAKS = re.compile("\n|\v")
+# Characters XML cannot hold even escaped; lxml, and with it python-pptx, rejects them
+_NON_XML_CHARS = re.compile("[\ufffe\uffff]")
+
+TABLE_STYLE_ID = "{5C22544A-7EE6-4342-B048-85BDC9FD1C3A}"
+
+
+def _text_xml(text: str) -> str:
+    if _NON_XML_CHARS.search(text):
+        # Same error as lxml raises for the python-pptx backend
+        raise ValueError("All strings must be XML compatible: Unicode or ASCII, no NULL bytes or control characters")
+    return escape(escape_control_chars(text))
+
+
+class _Paragraph:
+    """
+    Paragraph state, mirroring the attributes the python-pptx backend sets.
+    """
+    __slots__ = ('text', 'bold_runs', 'lvl', 'algn', 'sz', 'b')
+
+    def __init__(self):
+        self.text = ""
+        self.bold_runs = False
+        self.lvl = 0
+        self.algn = None
+        self.sz = None
+        self.b = None
+
+    def set_text(self, text: str) -> None:
+        # Assigning text replaces the runs, and with them any run formatting
+        self.text = text
+        self.bold_runs = False
+
+    def xml(self) -> str:
+        parts = ["<a:p>"]
+        if self.lvl or self.algn or self.sz is not None or self.b is not None:
+            attrs = ""
+            if self.algn:
+                attrs += f' algn="{self.algn}"'
+            if self.lvl:
+                attrs += f' lvl="{self.lvl}"'
+            if self.sz is not None or self.b is not None:
+                rpr = ""
+                if self.sz is not None:
+                    rpr += f' sz="{self.sz}"'
+                if self.b is not None:
+                    rpr += f' b="{1 if self.b else 0}"'
+                parts.append(f"<a:pPr{attrs}><a:defRPr{rpr}/></a:pPr>")
+            else:
+                parts.append(f"<a:pPr{attrs}/>")
+        run_open = '<a:r><a:rPr b="1"/><a:t>' if self.bold_runs else "<a:r><a:t>"
+        for idx, run_text in enumerate(_LINE_BREAKS.split(self.text)):
+            if idx > 0:
+                parts.append("<a:br/>")
+            if run_text:
+                parts.append(run_open + _text_xml(run_text) + "</a:t></a:r>")
+        if len(parts) == 1:
+            return "<a:p/>"
+        parts.append("</a:p>")
+        return "".join(parts)
+
+
+def _paragraphs_xml(paragraphs: List[_Paragraph]) -> str:
+    return "".join(p.xml() for p in paragraphs)
+
+
+class _LayoutPrototype:
+    """
+    Pre-serialized XML of a new slide based on one layout: the slide head and
+    tail, and each cloned placeholder split around its text body.
+    """
+
+    def __init__(self, partname: str, slide_xml: bytes):
+        self.partname = partname
+        text = slide_xml.decode("utf-8")
+        spTree = etree.fromstring(slide_xml).find(f"{{{NS_P}}}cSld/{{{NS_P}}}spTree")
+        # Placeholders: (idx, xml before txBody or whole xml, has_txBody)
+        self.placeholders: List[Tuple[int, str, bool]] = []
+        children = list(spTree)[2:]  # skip nvGrpSpPr and grpSpPr
+        start = end = None
+        for child in children:
+            xml = etree.tostring(child, encoding="unicode")
+            xml = re.sub(r' xmlns:\w+="[^"]*"', "", xml)
+            pos = text.index(xml, end or 0)
+            if start is None:
+                start = pos
+            end = pos + len(xml)
+            ph = child.find(f".//{{{NS_P}}}ph")
+            idx = int(ph.get("idx", "0")) if ph is not None else -1
+            marker = "<p:txBody>"
+            if marker in xml:
+                self.placeholders.append((idx, xml[:xml.index(marker)], True))
+            else:
+                self.placeholders.append((idx, xml, False))
+        if start is None:
+            start = end = text.index("</p:spTree>")
+        self.head = text[:start]
+        self.tail = text[end:]
+        self.max_shape_id = max(int(v) for v in spTree.xpath(".//p:cNvPr/@id", namespaces={"p": NS_P}))
+
+    def has_text_placeholder(self, idx: int) -> bool:
+        return any(ph_idx == idx and has_body for ph_idx, _, has_body in self.placeholders)
+
+
+class NativeDeckWriter:
+    """
+    Rendering backend that writes slide XML directly instead of going through
+    python-pptx's shape and text proxies.
+
+    The skeleton package is the converter's presentation (template plus any
+    existing slides) saved once. python-pptx is used once per layout to build
+    the placeholder prototype of a new slide; every slide after that is
+    string-assembled and the package is written at the zip level on save().
+    The output matches the python-pptx backend part for part. With a spool
+    directory, slides go to disk as soon as they are rendered.
+    """
+
+    def __init__(self, converter, spool_dir: Optional[str] = None):
+        """
+        Args:
+            converter (MarkdownToPPTX): Converter supplying the presentation, text helpers and metrics
+            spool_dir (str, optional): If given, each finished slide is written straight into a
+            temporary package in this directory instead of being kept in memory, so memory use
+            does not grow with the slide count. save() then renames the package into place,
+            so use a directory on the same filesystem as the output.
+        """
+        self.converter = converter
+        self.metrics = converter.metrics
+        self.slide_width = converter.presentation.slide_width
+        self.slide_height = converter.presentation.slide_height
+
+        buffer = io.BytesIO()
+        converter.presentation.save(buffer)
+        self._skeleton = buffer.getvalue()
+        self._package = PackageReader(io.BytesIO(self._skeleton))
+        self._presentation = self._package.main_part()
+        self._existing_slides = len(self._package.slide_parts())
+        self._prototypes: Dict[int, _LayoutPrototype] = {}
+        # Rendered slides as (slide XML, layout part name); stays empty in spool mode
+        self.slides: List[Tuple[bytes, str]] = []
+        self.slide_count = 0
+
+        self._spool: Optional[zipfile.ZipFile] = None
+        self._spool_path: Optional[str] = None
+        if spool_dir is not None:
+            self._spool_path = temporary_path(spool_dir, ".pptx.tmp")
+            self._spool = zipfile.ZipFile(self._spool_path, "x", zipfile.ZIP_DEFLATED)
+            self._write_skeleton(self._spool)
+
+    def _prototype(self, layout_index: int) -> _LayoutPrototype:
+        prototype = self._prototypes.get(layout_index)
+        if prototype is None:
+            scratch = Presentation(io.BytesIO(self._skeleton))
+            layout = scratch.slide_layouts[layout_index]
+            slide = scratch.slides.add_slide(layout)
+            prototype = _LayoutPrototype(layout.part.partname.lstrip("/"), slide.part.blob)
+            self._prototypes[layout_index] = prototype
+        return prototype
+
+    # ------------------------------------------------------------------ slides
+
+    def _placeholder_xml(self, prototype: _LayoutPrototype, bodies: Dict[int, str]) -> str:
+        parts = []
+        for idx, xml, has_body in prototype.placeholders:
+            if has_body:
+                body = bodies.get(idx, "<a:p/>")
+                parts.append(f"{xml}<p:txBody><a:bodyPr/><a:lstStyle/>{body}</p:txBody></p:sp>")
+            else:
+                parts.append(xml)
+        return "".join(parts)
+
+    @staticmethod
+    def _textbox_xml(shape_id: int, left: int, top: int, width: int, height: int, body: str) -> str:
+        return (
+            f'<p:sp><p:nvSpPr><p:cNvPr id="{shape_id}" name="TextBox {shape_id - 1}"/>'
+            f'<p:cNvSpPr txBox="1"/><p:nvPr/></p:nvSpPr>'
+            f'<p:spPr><a:xfrm><a:off x="{left}" y="{top}"/><a:ext cx="{width}" cy="{height}"/></a:xfrm>'
+            f'<a:prstGeom prst="rect"><a:avLst/></a:prstGeom><a:noFill/></p:spPr>'
+            f'<p:txBody><a:bodyPr wrap="none"><a:spAutoFit/></a:bodyPr><a:lstStyle/>{body}</p:txBody></p:sp>'
+        )
+
+    def _title_paragraph(self, title: str) -> _Paragraph:
+        clean_title, bold_positions = self.converter.remove_bold_formatting(title)
+        p = _Paragraph()
+        p.set_text(clean_title)
+        p.bold_runs = bool(bold_positions)
+        return p
+
+    def create_title_slide(self, title: str) -> None:
+        """
+        Render a title slide (layout 0), equivalent to MarkdownToPPTX.create_title_slide.
+
+        Args:
+            title (str): The title for the slide
+        """
+        prototype = self._prototype(0)
+        shapes = []
+        if prototype.has_text_placeholder(0):
+            p = self._title_paragraph(title)
+            shapes.append(self._placeholder_xml(prototype, {0: p.xml()}))
+        else:
+            shapes.append(self._placeholder_xml(prototype, {}))
+            clean_title, _ = self.converter.remove_bold_formatting(title)
+            p = _Paragraph()
+            p.set_text(clean_title)
+            p.algn = "ctr"
+            p.sz = Pt(44).centipoints
+            p.b = True
+            shapes.append(self._textbox_xml(
+                prototype.max_shape_id + 1, Cm(2), Cm(3), self.slide_width - Cm(4), Cm(3), p.xml()
+            ))
+        self._add_slide(prototype, shapes)
+
+    def create_content_slide(self, title: str, content: List[dict]) -> None:
+        """
+        Render a content slide (layout 1), equivalent to MarkdownToPPTX.create_content_slide.
+
+        Args:
+            title (str): The slide title
+            content (list): List of content items with type, level, and text
+        """
+        converter = self.converter
+        prototype = self._prototype(1)
+        next_id = prototype.max_shape_id + 1
+        bodies = {}
+        extra_shapes = []
+
+        if prototype.has_text_placeholder(0):
+            p = self._title_paragraph(title)
+            bodies[0] = p.xml()
+        else:
+            clean_title, _ = converter.remove_bold_formatting(title)
+            p = _Paragraph()
+            p.set_text(clean_title)
+            p.sz = Pt(28).centipoints
+            p.b = True
+            extra_shapes.append(self._textbox_xml(
+                next_id, Cm(1), Cm(0.5), self.slide_width - Cm(2), Cm(1.5), p.xml()
+            ))
+            next_id += 1
+
+        # Text paragraphs go to placeholder idx 1 or, failing that, a new text box
+        paragraphs = [_Paragraph()]
+        content_box_id = None
+        if not prototype.has_text_placeholder(1):
+            content_box_id = next_id
+            next_id += 1
+            extra_shapes.append(None)  # filled in once the paragraphs are known
+        content_box_index = len(extra_shapes) - 1
+
+        current_top = Inches(1.5)
+        left_margin = Inches(1)
+        content_width = Inches(8)
+        table_max_width = self.slide_width - 2 * left_margin
+
+        for item in content:
+            item_type = item['type']
+            if item_type in ('header', 'bullet', 'paragraph'):
+                if len(paragraphs) == 1 and not paragraphs[0].text:
+                    p = paragraphs[0]
+                else:
+                    p = _Paragraph()
+                    paragraphs.append(p)
+                clean_text, bold_positions = converter.remove_bold_formatting(item['text'])
+                p.set_text(clean_text)
+                if item_type == 'header':
+                    p.lvl = max(0, item['level'] - 3)
+                    p.sz = Pt(max(16, 28 - (item['level'] - 3) * 2)).centipoints
+                    p.b = True
+                elif item_type == 'bullet':
+                    p.lvl = item['level']
+                    p.sz = Pt(18).centipoints
+                else:
+                    p.sz = Pt(16).centipoints
+                if bold_positions:
+                    p.bold_runs = True
+            elif item_type == 'table':
+                table_data = converter.guard.limit_table(item['table'])
+                rows = table_data.n_rows
+                if rows > 0 and table_data.n_cols > 0:
+                    cells = [[converter.remove_bold_formatting(text)[0] for text in column]
+                             for column in table_data.columns]
+                    col_widths, font_size = layout_columns(cells, content_width, table_max_width)
+                    table_height = min(Inches(4), Inches(0.3 * rows))
+                    extra_shapes.append(self._table_xml(
+                        next_id, cells, table_data.alignments, col_widths, font_size,
+                        left_margin, current_top, table_height
+                    ))
+                    next_id += 1
+                    current_top += table_height + Inches(0.2)
+                    self.metrics.tables.inc()
+
+        body = _paragraphs_xml(paragraphs)
+        if content_box_id is None:
+            bodies[1] = body
+        else:
+            extra_shapes[content_box_index] = self._textbox_xml(
+                content_box_id, Cm(1), Cm(2), self.slide_width - Cm(2), self.slide_height - Cm(3), body
+            )
+
+        self._add_slide(prototype, [self._placeholder_xml(prototype, bodies)] + extra_shapes)
+
+    def _table_xml(self, shape_id: int, cells: List[List[str]], alignments: List[Optional[str]],
+                   col_widths: List[int], font_size: int, left: int, top: int, height: int) -> str:
+        guard = self.converter.guard
+        rows = len(cells[0])
+        width = sum(col_widths)
+        parts = [
+            f'<p:graphicFrame><p:nvGraphicFramePr><p:cNvPr id="{shape_id}" name="Table {shape_id - 1}"/>'
+            f'<p:cNvGraphicFramePr><a:graphicFrameLocks noGrp="1"/></p:cNvGraphicFramePr><p:nvPr/>'
+            f'</p:nvGraphicFramePr><p:xfrm><a:off x="{left}" y="{top}"/><a:ext cx="{width}" cy="{height}"/>'
+            f'</p:xfrm><a:graphic><a:graphicData uri="http://schemas.openxmlformats.org/drawingml/2006/table">'
+            f'<a:tbl><a:tblPr firstRow="1" bandRow="1"><a:tableStyleId>{TABLE_STYLE_ID}</a:tableStyleId>'
+            f'</a:tblPr><a:tblGrid>'
+        ]
+        parts.extend(f'<a:gridCol w="{w}"/>' for w in col_widths)
+        parts.append("</a:tblGrid>")
+
+        # Row heights are distributed as python-pptx does, with the last row
+        # absorbing the remainder
+        row_height = height // rows
+        sz = Pt(font_size).centipoints
+        for row_idx in range(rows):
+            guard.check()
+            h = height - (rows - 1) * row_height if row_idx == rows - 1 else row_height
+            parts.append(f'<a:tr h="{h}">')
+            for column, algn in zip(cells, alignments):
+                p = _Paragraph()
+                p.set_text(column[row_idx])
+                p.sz = sz
+                p.algn = algn
+                if row_idx == 0:
+                    p.b = True
+                parts.append(f"<a:tc><a:txBody><a:bodyPr/><a:lstStyle/>{p.xml()}</a:txBody><a:tcPr/></a:tc>")
+            parts.append("</a:tr>")
+        parts.append("</a:tbl></a:graphicData></a:graphic></p:graphicFrame>")
+        return "".join(parts)
+
+    def _add_slide(self, prototype: _LayoutPrototype, shapes: List[str]) -> None:
+        xml = (prototype.head + "".join(shapes) + prototype.tail).encode("utf-8")
+        if self._spool is not None:
+            # Write the finished slide out now; nothing of it is kept in memory
+            self._write_slide(self._spool, self._existing_slides + self.slide_count + 1, xml, prototype.partname)
+        else:
+            self.slides.append((xml, prototype.partname))
+        self.slide_count += 1
+        self.metrics.slides.inc()
+
+    # -------------------------------------------------------------------- save
+
+    def _write_skeleton(self, out: zipfile.ZipFile) -> None:
+        held_back = {"[Content_Types].xml", self._presentation, rels_path(self._presentation)}
+        for info in self._package.zip.infolist():
+            if info.filename not in held_back:
+                out.writestr(info, self._package.zip.read(info))
+
+    @staticmethod
+    def _write_slide(out: zipfile.ZipFile, number: int, slide_xml: bytes, layout_part: str) -> None:
+        slide_part = f"ppt/slides/slide{number}.xml"
+        out.writestr(slide_part, slide_xml)
+        out.writestr(
+            rels_path(slide_part),
+            serialize_rels([Relationship("rId1", RT_SLIDE_LAYOUT, layout_part, False)], slide_part),
+        )
+
+    def _write_presentation_parts(self, out: zipfile.ZipFile) -> None:
+        """
+        Write the presentation part, its relationships and the content types,
+        registering every rendered slide.
+        """
+        skeleton = self._package
+        presentation = self._presentation
+        presentation_rels = list(skeleton.rels(presentation))
+        root = etree.fromstring(skeleton.read(presentation))
+        overrides = dict(skeleton.overrides)
+
+        sld_id_lst = slide_id_list(root)
+        next_slide_id = max([255] + [int(el.get("id")) for el in sld_id_lst]) + 1
+        used_rIds = {rel.rId for rel in presentation_rels}
+
+        for number in range(self._existing_slides + 1, self._existing_slides + self.slide_count + 1):
+            slide_part = f"ppt/slides/slide{number}.xml"
+            overrides[slide_part] = CT_SLIDE
+
+            # Same rId choice as python-pptx: highest free number up to len + 1
+            n = len(used_rIds) + 1
+            while f"rId{n}" in used_rIds:
+                n -= 1
+            rId = f"rId{n}"
+            used_rIds.add(rId)
+            presentation_rels.append(Relationship(rId, RT_SLIDE, slide_part, False))
+            sld_id = etree.SubElement(sld_id_lst, f"{{{NS_P}}}sldId")
+            sld_id.set("id", str(next_slide_id))
+            sld_id.set(f"{{{NS_R}}}id", rId)
+            next_slide_id += 1
+
+        presentation_rels.sort(key=lambda rel: (int(rel.rId[3:]) if rel.rId[3:].isdigit() else 0, rel.rId))
+        out.writestr(presentation, etree.tostring(root, encoding="UTF-8", standalone=True))
+        out.writestr(rels_path(presentation), serialize_rels(presentation_rels, presentation))
+        out.writestr(
+            "[Content_Types].xml",
+            serialize_content_types(skeleton.defaults, dict(sorted(overrides.items()))),
+        )
+
+    def save(self, path: str) -> None:
+        """
+        Write the skeleton package plus the rendered slides to a .pptx file.
+        In spool mode the spool file is completed and renamed to `path`.
+
+        Args:
+            path (str): Output file path
+        """
+        if self._spool is not None:
+            self._write_presentation_parts(self._spool)
+            self._spool.close()
+            self._spool = None
+            os.replace(self._spool_path, path)
+            self._spool_path = None
+            return
+
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as out:
+            self._write_skeleton(out)
+            for number, (slide_xml, layout_part) in enumerate(self.slides, self._existing_slides + 1):
+                self._write_slide(out, number, slide_xml, layout_part)
+            self._write_presentation_parts(out)
+
+    def discard(self) -> None:
+        """
+        Drop an unfinished spool file, e.g. after a failed conversion.
+        """
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+        if self._spool_path is not None and os.path.exists(self._spool_path):
+            os.unlink(self._spool_path)
+        self._spool_path = None
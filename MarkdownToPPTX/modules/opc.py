@@ -0,0 +1,261 @@
+# opc.py
+
+import posixpath
+import re
+import zipfile
+from typing import IO, Dict, List, NamedTuple, Optional, Union
+from xml.sax.saxutils import quoteattr
+
+from lxml import etree
+
+
+# Namespaces
+NS_CT = "http://schemas.openxmlformats.org/package/2006/content-types"
+NS_PR = "http://schemas.openxmlformats.org/package/2006/relationships"
+NS_R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+NS_P = "http://schemas.openxmlformats.org/presentationml/2006/main"
+NS_A = "http://schemas.openxmlformats.org/drawingml/2006/main"
+
+# Relationship types
+RT_SLIDE = NS_R + "/slide"
+RT_SLIDE_LAYOUT = NS_R + "/slideLayout"
+RT_SLIDE_MASTER = NS_R + "/slideMaster"
+RT_NOTES_SLIDE = NS_R + "/notesSlide"
+
+# Content types
+CT_SLIDE = "application/vnd.openxmlformats-officedocument.presentationml.slide+xml"
+CT_SLIDE_LAYOUT = "application/vnd.openxmlformats-officedocument.presentationml.slideLayout+xml"
+CT_SLIDE_MASTER = "application/vnd.openxmlformats-officedocument.presentationml.slideMaster+xml"
+
+XML_DECLARATION = b"<?xml version='1.0' encoding='UTF-8' standalone='yes'?>\n"
+
+# Characters python-pptx stores as _xHHHH_ escapes because XML cannot hold them
+_CTRL_CHARS = re.compile(r"([\x00-\x08\x0B-\x1F])")
+
+
+class Relationship(NamedTuple):
+    """
+    A single package relationship. For internal relationships target is the
+    absolute part name (without leading slash); for external ones it is the raw URI.
+    """
+    rId: str
+    reltype: str
+    target: str
+    external: bool
+
+
+def rels_path(part_name: str) -> str:
+    """
+    Return the name of the .rels part belonging to a part.
+
+    Args:
+        part_name (str): Part name such as 'ppt/slides/slide1.xml'
+
+    Returns:
+        str: Rels part name such as 'ppt/slides/_rels/slide1.xml.rels'
+    """
+    directory, filename = posixpath.split(part_name)
+    return posixpath.join(directory, "_rels", filename + ".rels")
+
+
+def relative_target(source_part: str, target_part: str) -> str:
+    """
+    Return the relative reference from one part to another, as stored in a .rels file.
+
+    Args:
+        source_part (str): Part owning the relationship
+        target_part (str): Part being referenced
+
+    Returns:
+        str: Relative target path
+    """
+    return posixpath.relpath(target_part, posixpath.dirname(source_part) or ".")
+
+
+def serialize_rels(rels: List[Relationship], source_part: str) -> bytes:
+    """
+    Serialize relationships to the bytes of a .rels part.
+
+    Args:
+        rels (List[Relationship]): Relationships to write
+        source_part (str): Part owning the relationships, used to relativize targets
+
+    Returns:
+        bytes: The .rels XML
+    """
+    items = []
+    for rel in rels:
+        if rel.external:
+            items.append(
+                f'<Relationship Id={quoteattr(rel.rId)} Type={quoteattr(rel.reltype)} '
+                f'Target={quoteattr(rel.target)} TargetMode="External"/>'
+            )
+        else:
+            target = relative_target(source_part, rel.target) if source_part else rel.target
+            items.append(
+                f'<Relationship Id={quoteattr(rel.rId)} Type={quoteattr(rel.reltype)} '
+                f'Target={quoteattr(target)}/>'
+            )
+    body = f'<Relationships xmlns="{NS_PR}">' + "".join(items) + "</Relationships>"
+    return XML_DECLARATION + body.encode("utf-8")
+
+
+def serialize_content_types(defaults: Dict[str, str], overrides: Dict[str, str]) -> bytes:
+    """
+    Serialize the [Content_Types].xml part.
+
+    Args:
+        defaults (Dict[str, str]): Extension -> content type
+        overrides (Dict[str, str]): Part name (without leading slash) -> content type
+
+    Returns:
+        bytes: The [Content_Types].xml XML
+    """
+    items = [
+        f'<Default Extension={quoteattr(ext)} ContentType={quoteattr(ct)}/>'
+        for ext, ct in sorted(defaults.items())
+    ]
+    items.extend(
+        f'<Override PartName={quoteattr("/" + name)} ContentType={quoteattr(ct)}/>'
+        for name, ct in overrides.items()
+    )
+    body = f'<Types xmlns="{NS_CT}">' + "".join(items) + "</Types>"
+    return XML_DECLARATION + body.encode("utf-8")
+
+
+def escape_control_chars(text: str) -> str:
+    """
+    Escape control characters the same way python-pptx does ("_x0007_").
+    """
+    return _CTRL_CHARS.sub(lambda m: "_x%04X_" % ord(m.group(1)), text)
+
+
+def slide_id_list(presentation_root: etree._Element) -> etree._Element:
+    """
+    Return the p:sldIdLst of a presentation part, creating it if the deck has no slides.
+
+    Args:
+        presentation_root (etree._Element): Root element of the presentation part
+
+    Returns:
+        etree._Element: The slide id list
+    """
+    sld_id_lst = presentation_root.find(f"{{{NS_P}}}sldIdLst")
+    if sld_id_lst is None:
+        # sldIdLst follows the master lists in the schema sequence
+        sld_id_lst = etree.Element(f"{{{NS_P}}}sldIdLst")
+        anchor = None
+        for tag in ("sldMasterIdLst", "notesMasterIdLst", "handoutMasterIdLst"):
+            found = presentation_root.find(f"{{{NS_P}}}{tag}")
+            if found is not None:
+                anchor = found
+        if anchor is not None:
+            anchor.addnext(sld_id_lst)
+        else:
+            presentation_root.insert(0, sld_id_lst)
+    return sld_id_lst
+
+
+class PackageReader:
+    """
+    Read-only view of an OPC (.pptx) package at the zip/XML level.
+    """
+
+    def __init__(self, path: Union[str, IO[bytes]]):
+        """
+        Open the package.
+
+        Args:
+            path (str | IO[bytes]): Path to the .pptx file, or a binary file object
+        """
+        self.path = path
+        self.zip = zipfile.ZipFile(path)
+        self.names = set(self.zip.namelist())
+        self.defaults: Dict[str, str] = {}
+        self.overrides: Dict[str, str] = {}
+        root = etree.fromstring(self.zip.read("[Content_Types].xml"))
+        for el in root:
+            tag = etree.QName(el).localname
+            if tag == "Default":
+                self.defaults[el.get("Extension").lower()] = el.get("ContentType")
+            elif tag == "Override":
+                self.overrides[el.get("PartName").lstrip("/")] = el.get("ContentType")
+        self._rels_cache: Dict[str, List[Relationship]] = {}
+
+    def close(self) -> None:
+        self.zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def read(self, part_name: str) -> bytes:
+        return self.zip.read(part_name)
+
+    def open(self, part_name: str) -> IO[bytes]:
+        """
+        Open a part for streaming instead of reading it whole.
+        """
+        return self.zip.open(part_name)
+
+    def content_type(self, part_name: str) -> Optional[str]:
+        """
+        Return the content type of a part from its Override or extension Default.
+        """
+        if part_name in self.overrides:
+            return self.overrides[part_name]
+        # The extension follows the last dot, so '_rels/.rels' has extension 'rels'
+        filename = posixpath.basename(part_name)
+        ext = filename.rpartition(".")[2].lower() if "." in filename else ""
+        return self.defaults.get(ext)
+
+    def rels(self, part_name: str) -> List[Relationship]:
+        """
+        Return the relationships of a part, with internal targets resolved to part names.
+
+        Args:
+            part_name (str): Source part name, or '' for the package-level rels
+
+        Returns:
+            List[Relationship]: The part's relationships (empty if it has none)
+        """
+        if part_name in self._rels_cache:
+            return self._rels_cache[part_name]
+        path = rels_path(part_name) if part_name else "_rels/.rels"
+        rels = []
+        if path in self.names:
+            base_dir = posixpath.dirname(part_name)
+            for el in etree.fromstring(self.zip.read(path)):
+                external = el.get("TargetMode") == "External"
+                target = el.get("Target")
+                if not external:
+                    if target.startswith("/"):
+                        target = target.lstrip("/")
+                    else:
+                        target = posixpath.normpath(posixpath.join(base_dir, target))
+                rels.append(Relationship(el.get("Id"), el.get("Type"), target, external))
+        self._rels_cache[part_name] = rels
+        return rels
+
+    def main_part(self) -> str:
+        """
+        Return the presentation part name (normally 'ppt/presentation.xml').
+        """
+        for rel in self.rels(""):
+            if rel.reltype.endswith("/officeDocument"):
+                return rel.target
+        raise ValueError(f"'{self.path}' is not a presentation package.")
+
+    def slide_parts(self) -> List[str]:
+        """
+        Return the slide part names in presentation order.
+        """
+        presentation = self.main_part()
+        by_id = {rel.rId: rel.target for rel in self.rels(presentation)}
+        root = etree.fromstring(self.read(presentation))
+        sld_id_lst = root.find(f"{{{NS_P}}}sldIdLst")
+        if sld_id_lst is None:
+            return []
+        return [by_id[el.get(f"{{{NS_R}}}id")] for el in sld_id_lst]
@@ -0,0 +1,200 @@
+# tables.py
+
+from typing import Callable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional; column widths are computed in pure Python without it
+    np = None
+
+
+# Cell alignment from separator markers, as DrawingML algn values
+ALIGN_LEFT = 'l'       # :---
+ALIGN_CENTER = 'ctr'   # :---:
+ALIGN_RIGHT = 'r'      # ---:
+
+# Column sizing, in text width units (an ASCII character is 2 units, a CJK character 3-4)
+MIN_COLUMN_UNITS = 6
+MAX_COLUMN_UNITS = 60
+PADDING_UNITS = 4      # left and right cell margins
+UNIT_EMU = 41910       # one unit at 12pt, about half an average character width
+
+TABLE_FONT_PT = 12
+MIN_TABLE_FONT_PT = 8
+
+
+def separator_alignments(line: str) -> Optional[List[Optional[str]]]:
+    """
+    Parse a table separator row (| :--- | :---: | ---: |) in linear time.
+
+    Args:
+        line (str): The line to check
+
+    Returns:
+        Optional[List[Optional[str]]]: The alignment of each column (None where no
+        colon is given), or None if the line is not a separator row
+    """
+    line = line.strip()
+    if line.startswith('|'):
+        line = line[1:]
+    if line.endswith('|'):
+        line = line[:-1]
+    cells = line.split('|')
+    if len(cells) < 2:
+        return None
+    alignments = []
+    for cell in cells:
+        cell = cell.strip()
+        left = cell.startswith(':')
+        if left:
+            cell = cell[1:]
+        right = cell.endswith(':')
+        if right:
+            cell = cell[:-1]
+        if not cell or cell.strip('-'):
+            return None
+        if left and right:
+            alignments.append(ALIGN_CENTER)
+        elif right:
+            alignments.append(ALIGN_RIGHT)
+        elif left:
+            alignments.append(ALIGN_LEFT)
+        else:
+            alignments.append(None)
+    return alignments
+
+
+class Table:
+    """
+    A markdown table parsed once: a column-major matrix of cell texts, padded
+    with empty cells to a full rectangle, and the alignment of each column.
+    """
+    __slots__ = ('columns', 'alignments', 'n_rows')
+
+    def __init__(self, columns: List[List[str]], alignments: List[Optional[str]], n_rows: int):
+        self.columns = columns
+        self.alignments = alignments
+        self.n_rows = n_rows
+
+    @property
+    def n_cols(self) -> int:
+        return len(self.columns)
+
+    def rows(self) -> List[List[str]]:
+        """
+        Return the cells row by row.
+        """
+        return [list(row) for row in zip(*self.columns)]
+
+    def head(self, n_rows: int, n_cols: int) -> 'Table':
+        """
+        Return the top-left n_rows x n_cols part of the table.
+        """
+        return Table([column[:n_rows] for column in self.columns[:n_cols]],
+                     self.alignments[:n_cols], min(n_rows, self.n_rows))
+
+
+def parse_table(lines: List[str], max_cells: Optional[int] = None,
+                tick: Optional[Callable[[], None]] = None) -> Table:
+    """
+    Parse markdown table lines into a Table. Separator rows are skipped; the
+    first one supplies the column alignments.
+
+    Args:
+        lines (List[str]): Lines containing table data
+        max_cells (int, optional): Stop reading rows once those read hold more cells
+        than this, leaving the rest of an oversized table unparsed
+        tick (Callable[[], None], optional): Called once per line, e.g. ConversionGuard.tick
+
+    Returns:
+        Table: The parsed table, with no rows if the lines hold no cells
+    """
+    rows = []
+    alignments = None
+    n_cols = 0
+    for line in lines:
+        if tick is not None:
+            tick()
+        separator = separator_alignments(line)
+        if separator is not None:
+            if alignments is None:
+                alignments = separator
+            continue
+
+        cells = [cell.strip() for cell in line.split('|')]
+        # Remove empty cells at start and end
+        if cells and cells[0] == '':
+            cells = cells[1:]
+        if cells and cells[-1] == '':
+            cells = cells[:-1]
+        if cells:
+            rows.append(cells)
+            n_cols = max(n_cols, len(cells))
+            if max_cells is not None and len(rows) * n_cols > max_cells:
+                break
+
+    columns = [[row[col] if col < len(row) else '' for row in rows] for col in range(n_cols)]
+    alignments = (alignments or [])[:n_cols]
+    alignments += [None] * (n_cols - len(alignments))
+    return Table(columns, alignments, len(rows))
+
+
+def _text_units(text: str) -> int:
+    # Characters plus UTF-8 bytes, so wide scripts count for more than ASCII
+    return len(text) + len(text.encode('utf-8'))
+
+
+def _clipped_text(text: str) -> str:
+    # Every character counts at least 2 units, so the first MAX_COLUMN_UNITS
+    # decide the clamped width of any cell. NUL is dropped (NumPy strings use it
+    # as padding) so both paths count the same characters
+    if '\0' in text:
+        text = text.replace('\0', '')
+    return text[:MAX_COLUMN_UNITS]
+
+
+def _column_units(columns: List[List[str]]) -> List[int]:
+    # Width of the widest cell per column, clamped to the column size range
+    if np is not None:
+        n_rows = len(columns[0])
+        # NumPy pads every element to the longest string, so cells are clipped
+        # first; otherwise one huge cell would be copied once per cell
+        cells = np.array([_clipped_text(text) for column in columns for text in column], dtype=str)
+        # One UTF-32 code point per element; each character is 1 unit plus its UTF-8 length
+        code_points = cells.view(np.uint32).reshape(len(cells), cells.itemsize // 4)
+        units = ((code_points > 0).astype(np.int64) * 2 + (code_points >= 0x80)
+                 + (code_points >= 0x800) + (code_points >= 0x10000)).sum(axis=1)
+        widest = units.reshape(len(columns), n_rows).max(axis=1)
+        return np.clip(widest, MIN_COLUMN_UNITS, MAX_COLUMN_UNITS).tolist()
+    return [
+        min(MAX_COLUMN_UNITS, max(MIN_COLUMN_UNITS, max(_text_units(_clipped_text(text)) for text in column)))
+        for column in columns
+    ]
+
+
+def layout_columns(columns: List[List[str]], min_width: int, max_width: int) -> Tuple[List[int], int]:
+    """
+    Size table columns in one batch from the length of their cell texts.
+
+    The table takes its natural width at 12pt, kept between min_width and
+    max_width, and each column gets a share proportional to its widest cell.
+    Tables too wide for max_width get a smaller font, down to 8pt.
+
+    Args:
+        columns (List[List[str]]): Column-major cell texts as rendered, all columns of equal length
+        min_width (int): Smallest table width in EMU
+        max_width (int): Largest table width in EMU
+
+    Returns:
+        Tuple[List[int], int]: Column widths in EMU and the font size in points
+    """
+    shares = [units + PADDING_UNITS for units in _column_units(columns)]
+    total_shares = sum(shares)
+    natural_width = total_shares * UNIT_EMU
+    width = min(max(natural_width, min_width), max_width)
+    font_pt = max(MIN_TABLE_FONT_PT, min(TABLE_FONT_PT, TABLE_FONT_PT * max_width // natural_width))
+
+    widths = [width * share // total_shares for share in shares]
+    # The last column absorbs the rounding remainder
+    widths[-1] = width - sum(widths[:-1])
+    return widths, font_pt
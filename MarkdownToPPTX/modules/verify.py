@@ -0,0 +1,336 @@
+# verify.py
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from lxml import etree
+
+from MarkdownToPPTX.modules.opc import NS_A, NS_P, PackageReader, escape_control_chars
+
+
+# Tags seen while stream-parsing slide XML
+_SP = f"{{{NS_P}}}sp"
+_FRAME = f"{{{NS_P}}}graphicFrame"
+_PH = f"{{{NS_P}}}ph"
+_P = f"{{{NS_A}}}p"
+_PPR = f"{{{NS_A}}}pPr"
+_DEF_RPR = f"{{{NS_A}}}defRPr"
+_R = f"{{{NS_A}}}r"
+_RPR = f"{{{NS_A}}}rPr"
+_T = f"{{{NS_A}}}t"
+_BR = f"{{{NS_A}}}br"
+_TBL = f"{{{NS_A}}}tbl"
+_TR = f"{{{NS_A}}}tr"
+_TC = f"{{{NS_A}}}tc"
+
+_TITLE_TYPES = ('title', 'ctrTitle')
+
+# Tags whose end events are handled; everything else stays in C
+_EVENT_TAGS = (_SP, _FRAME, _PH, _P, _PPR, _DEF_RPR, _R, _BR, _TC, _TR)
+
+# Differences reported per deck before the rest are elided
+MAX_DIFFERENCES = 20
+
+
+def _is_bold(value: Optional[str]) -> Optional[bool]:
+    if value is None:
+        return None
+    return value in ('1', 'true')
+
+
+class _Shape:
+    __slots__ = ('is_title', 'is_placeholder', 'paragraphs', 'rows')
+
+    def __init__(self, is_title: bool, is_placeholder: bool, paragraphs: List[dict],
+                 rows: Optional[List[List[str]]]):
+        self.is_title = is_title
+        self.is_placeholder = is_placeholder
+        self.paragraphs = paragraphs
+        self.rows = rows
+
+
+def _slide_structure(stream) -> dict:
+    """
+    Stream-parse one slide part into {'title', 'paragraphs', 'tables'}.
+
+    Only end events of the few tags that matter reach Python, and elements are
+    cleared as soon as their shape is done, so the tree never holds more than one shape.
+    """
+    shapes: List[_Shape] = []
+    paragraphs: List[dict] = []
+    runs: List[Tuple[str, Optional[bool]]] = []
+    level = 0
+    default_bold = None
+    is_title = is_placeholder = False
+    rows: Optional[List[List[str]]] = None
+    row: List[str] = []
+
+    for _, el in etree.iterparse(stream, events=('end',), tag=_EVENT_TAGS):
+        tag = el.tag
+        if tag == _R:
+            rpr = el.find(_RPR)
+            runs.append((el.findtext(_T) or '', _is_bold(rpr.get('b')) if rpr is not None else None))
+        elif tag == _P:
+            text = ''.join(text for text, _ in runs)
+            bold = [text for text, b in runs if text.strip() and (default_bold if b is None else b)]
+            paragraphs.append({'level': level, 'text': text, 'bold': bold})
+            runs, level, default_bold = [], 0, None
+        elif tag == _PPR:
+            level = int(el.get('lvl', 0))
+        elif tag == _DEF_RPR:
+            if el.getparent().tag == _PPR:
+                default_bold = _is_bold(el.get('b'))
+        elif tag == _BR:
+            runs.append(('\n', None))
+        elif tag == _TC:
+            row.append('\n'.join(p['text'] for p in paragraphs))
+            paragraphs = []
+        elif tag == _TR:
+            if rows is None:
+                rows = []
+            rows.append(row)
+            row = []
+        elif tag == _PH:
+            is_placeholder = True
+            is_title = el.get('type') in _TITLE_TYPES
+        else:  # p:sp or p:graphicFrame
+            shapes.append(_Shape(is_title, is_placeholder, [p for p in paragraphs if p['text']], rows))
+            paragraphs, rows = [], None
+            is_title = is_placeholder = False
+            el.clear()
+
+    # The title is the title placeholder or, on layouts without one, the
+    # first text box the converter added
+    title_shape = next((s for s in shapes if s.is_title), None)
+    if title_shape is None:
+        title_shape = next((s for s in shapes if not s.is_placeholder and s.rows is None), None)
+    structure = {'title': '', 'paragraphs': [], 'tables': []}
+    for s in shapes:
+        if s is title_shape:
+            structure['title'] = '\n'.join(p['text'] for p in s.paragraphs)
+        elif s.rows is not None:
+            structure['tables'].append(s.rows)
+        else:
+            structure['paragraphs'].extend(s.paragraphs)
+    return structure
+
+
+def extract_structure(path: str) -> List[dict]:
+    """
+    Extract the normalized structure of a generated deck without loading it
+    through python-pptx.
+
+    Args:
+        path (str): Path to the .pptx file
+
+    Returns:
+        List[dict]: One {'title', 'paragraphs', 'tables'} dictionary per slide, in order.
+        Paragraphs are {'level', 'text', 'bold'} with the texts of the bold runs;
+        empty paragraphs are left out. Tables are lists of rows of cell texts.
+    """
+    with PackageReader(path) as package:
+        slides = []
+        for part in package.slide_parts():
+            with package.open(part) as stream:
+                slides.append(_slide_structure(stream))
+        return slides
+
+
+def _rendered_text(text: str) -> str:
+    # Text as it reads back from a saved deck: vertical tabs become line
+    # breaks and other control characters are escaped as _xHHHH_
+    return escape_control_chars(text.replace('\v', '\n'))
+
+
+def expected_structure(converter, markdown_text: str) -> List[dict]:
+    """
+    Build the structure convert() should produce for a markdown text, in the
+    form returned by extract_structure().
+
+    Args:
+        converter (MarkdownToPPTX): Converter whose parser to use
+        markdown_text (str): The markdown content
+
+    Returns:
+        List[dict]: Expected slide structures
+    """
+    def paragraph(text: str, level: int, bold: bool) -> Optional[dict]:
+        clean_text, bold_positions = converter.remove_bold_formatting(text)
+        clean_text = _rendered_text(clean_text)
+        if not clean_text:
+            return None
+        bold = bold or bool(bold_positions)
+        return {'level': level, 'text': clean_text, 'bold': [clean_text] if bold and clean_text.strip() else []}
+
+    def clean(text: str) -> str:
+        return _rendered_text(converter.remove_bold_formatting(text)[0])
+
+    slides = []
+    for i, slide_data in enumerate(converter.parse_markdown(markdown_text)):
+        if i == 0 and slide_data['title']:
+            slides.append({'title': clean(slide_data['title']), 'paragraphs': [], 'tables': []})
+            if not slide_data['content']:
+                continue
+        structure = {'title': clean(slide_data['title']), 'paragraphs': [], 'tables': []}
+        for item in slide_data['content']:
+            if item['type'] == 'table':
+                table = item['table']
+                if table.n_rows:
+                    structure['tables'].append([[clean(text) for text in row] for row in table.rows()])
+                continue
+            if item['type'] == 'header':
+                p = paragraph(item['text'], max(0, item['level'] - 3), True)
+            elif item['type'] == 'bullet':
+                p = paragraph(item['text'], item['level'], False)
+            else:
+                p = paragraph(item['text'], 0, False)
+            if p is not None:
+                structure['paragraphs'].append(p)
+        slides.append(structure)
+    return slides
+
+
+def compare_structures(actual: List[dict], expected: List[dict]) -> List[str]:
+    """
+    List the differences between two deck structures.
+
+    Args:
+        actual (List[dict]): Structure extracted from the deck
+        expected (List[dict]): Expected structure (from markdown or a snapshot)
+
+    Returns:
+        List[str]: Human-readable differences, empty if the decks match
+    """
+    differences = []
+    if len(actual) != len(expected):
+        differences.append(f"slide count {len(actual)} != expected {len(expected)}")
+    for number, (got, want) in enumerate(zip(actual, expected), 1):
+        for key in ('title', 'paragraphs', 'tables'):
+            if got[key] == want[key]:
+                continue
+            if key == 'title':
+                differences.append(f"slide {number}: title {got[key]!r} != expected {want[key]!r}")
+                continue
+            if len(got[key]) != len(want[key]):
+                differences.append(f"slide {number}: {len(got[key])} {key} != expected {len(want[key])}")
+            for index, (a, b) in enumerate(zip(got[key], want[key]), 1):
+                if a != b:
+                    differences.append(f"slide {number}: {key[:-1]} {index} {a!r} != expected {b!r}")
+    return differences
+
+
+_converter = None
+
+
+def _get_converter():
+    # One converter per worker process, only needed for its parser
+    global _converter
+    if _converter is None:
+        from MarkdownToPPTX.MarkdownToPPTX import MarkdownToPPTX
+        _converter = MarkdownToPPTX()
+    return _converter
+
+
+def verify_deck(deck_path: str, reference_path: str, update: bool = False) -> List[str]:
+    """
+    Verify one deck against a markdown file (.md) or a golden snapshot (.json).
+
+    Args:
+        deck_path (str): Path to the generated .pptx
+        reference_path (str): Markdown source or JSON snapshot to compare with
+        update (bool): Write the deck's structure to the snapshot instead of comparing
+
+    Returns:
+        List[str]: Differences found, empty if the deck matches
+    """
+    actual = extract_structure(deck_path)
+    if update:
+        with open(reference_path, 'w', encoding='utf-8') as f:
+            json.dump(actual, f, ensure_ascii=False, indent=1)
+        return []
+    if not os.path.exists(reference_path):
+        return [f"reference '{reference_path}' not found"]
+    with open(reference_path, 'r', encoding='utf-8') as f:
+        if reference_path.endswith('.json'):
+            expected = json.load(f)
+        else:
+            expected = expected_structure(_get_converter(), f.read())
+    return compare_structures(actual, expected)
+
+
+def _verify_job(job: Tuple[str, str, bool]) -> Tuple[str, List[str]]:
+    deck_path, reference_path, update = job
+    try:
+        return deck_path, verify_deck(deck_path, reference_path, update)
+    except Exception as e:
+        return deck_path, [f"{type(e).__name__}: {e}"]
+
+
+def verify_decks(jobs: Iterable[Tuple[str, str]], workers: Optional[int] = None,
+                 update: bool = False) -> Dict[str, List[str]]:
+    """
+    Verify many decks in parallel worker processes.
+
+    Args:
+        jobs (Iterable[Tuple[str, str]]): (deck path, reference path) pairs
+        workers (int, optional): Worker processes, defaults to the CPU count; 1 runs inline
+        update (bool): Write golden snapshots instead of comparing
+
+    Returns:
+        Dict[str, List[str]]: Differences per deck path
+    """
+    jobs = [(deck, reference, update) for deck, reference in jobs]
+    if workers == 1 or len(jobs) <= 1:
+        return dict(map(_verify_job, jobs))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 4))
+        return dict(executor.map(_verify_job, jobs, chunksize=chunksize))
+
+
+def main() -> int:
+    """
+    Command line entry point: verify generated decks against their markdown or golden snapshots.
+    """
+    parser = argparse.ArgumentParser(description="Verify the structure of generated .pptx decks.")
+    parser.add_argument("decks", nargs="+", help=".pptx decks to verify")
+    reference = parser.add_mutually_exclusive_group(required=True)
+    reference.add_argument("--markdown-dir", help="compare with <dir>/<deck name>.md")
+    reference.add_argument("--golden-dir", help="compare with the snapshot <dir>/<deck name>.json")
+    parser.add_argument("--update", action="store_true", help="rewrite the golden snapshots")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+    if args.update and not args.golden_dir:
+        parser.error("--update requires --golden-dir")
+
+    directory, ext = (args.markdown_dir, ".md") if args.markdown_dir else (args.golden_dir, ".json")
+    if args.update:
+        os.makedirs(directory, exist_ok=True)
+    jobs = [
+        (deck, os.path.join(directory, os.path.splitext(os.path.basename(deck))[0] + ext))
+        for deck in args.decks
+    ]
+
+    started = time.perf_counter()
+    results = verify_decks(jobs, workers=args.jobs, update=args.update)
+    failed = 0
+    for deck, differences in results.items():
+        if not differences:
+            continue
+        failed += 1
+        print(f"FAIL {deck}")
+        for difference in differences[:MAX_DIFFERENCES]:
+            print(f"  {difference}")
+        if len(differences) > MAX_DIFFERENCES:
+            print(f"  ... {len(differences) - MAX_DIFFERENCES} more")
+    action = "snapshotted" if args.update else "verified"
+    print(f"{len(results)} deck(s) {action}, {failed} mismatched, in {time.perf_counter() - started:.2f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
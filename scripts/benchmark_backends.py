@@ -0,0 +1,59 @@
+# Side-by-side benchmark of the python-pptx and native rendering backends
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from MarkdownToPPTX.MarkdownToPPTX import MarkdownToPPTX, BACKENDS
+
+
+def generate_markdown(slides: int) -> str:
+    """
+    Generate a synthetic deck with headers, nested bullets, bold text and a table per slide.
+    """
+    sections = ["# Benchmark Deck"]
+    for n in range(slides):
+        sections.append(
+            f"## Slide {n}\n\n"
+            f"### **Section** {n}\n"
+            "- First point with **bold** text\n"
+            "\t- Nested point\n"
+            "- Second point\n"
+            "Plain paragraph text.\n\n"
+            "| Name | Value | Note |\n"
+            "| :--- | :---: | ---: |\n"
+            f"| a{n} | {n} | **x** |\n"
+            f"| b{n} | {n * 2} | y |\n"
+        )
+    return "\n\n---\n\n".join(sections)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark convert() rendering backends.")
+    parser.add_argument("--slides", type=int, default=1000, help="number of content slides")
+    parser.add_argument("--template", default="./assets/templates/template.pptx", help="PPTX template")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_file = os.path.join(tmp, "bench.md")
+        with open(input_file, "w", encoding="utf-8") as f:
+            f.write(generate_markdown(args.slides))
+
+        timings = {}
+        for backend in BACKENDS:
+            converter = MarkdownToPPTX(args.template)
+            started = time.perf_counter()
+            converter.convert(input_file, os.path.join(tmp, backend), backend=backend)
+            timings[backend] = time.perf_counter() - started
+
+    for backend, seconds in timings.items():
+        print(f"{backend:>8}: {seconds:8.3f}s")
+    print(f" speedup: {timings['pptx'] / timings['native']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
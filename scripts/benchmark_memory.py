@@ -0,0 +1,85 @@
+# Peak-memory benchmark of the rendering modes as the slide count grows
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from scripts.benchmark_backends import generate_markdown
+
+# Each run happens in a fresh interpreter so ru_maxrss is the peak of that run only
+CHILD = """
+import resource, sys
+sys.path.insert(0, {root!r})
+from MarkdownToPPTX.MarkdownToPPTX import MarkdownToPPTX
+converter = MarkdownToPPTX({template!r})
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+converter.convert({input!r}, {output!r}, backend={backend!r}, spool={spool!r})
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(baseline, peak)
+"""
+
+MODES = {
+    "pptx": ("pptx", False),
+    "native": ("native", False),
+    "spool": ("native", True),
+}
+
+# Modes whose memory growth is bounded; spooling still keeps the markdown text and
+# one zip directory entry per part, about 2.3 KB per slide
+BOUNDED_MODES = ("spool",)
+
+
+def peak_rss_mb(input_file: str, output_dir: str, template: str, mode: str) -> tuple:
+    backend, spool = MODES[mode]
+    code = CHILD.format(root=ROOT, template=template, input=input_file, output=output_dir,
+                        backend=backend, spool=spool)
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    baseline, peak = (int(v) for v in result.stdout.split()[-2:])
+    # ru_maxrss is in KiB on Linux
+    return baseline / 1024, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure peak RSS of convert() per rendering mode.")
+    parser.add_argument("--slides", type=int, nargs="+", default=[500, 2000, 5000], help="slide counts")
+    parser.add_argument("--modes", nargs="+", default=["native", "spool"], choices=sorted(MODES))
+    parser.add_argument("--template", default="./assets/templates/template.pptx", help="PPTX template")
+    parser.add_argument("--max-kb-per-slide", type=float, default=4.0,
+                        help="fail if a bounded mode grows by more than this per slide")
+    args = parser.parse_args()
+
+    growth = {mode: [] for mode in args.modes}
+    print(f"{'slides':>8} {'mode':>8} {'baseline MB':>12} {'peak MB':>10} {'growth MB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for slides in args.slides:
+            input_file = os.path.join(tmp, f"bench{slides}.md")
+            with open(input_file, "w", encoding="utf-8") as f:
+                f.write(generate_markdown(slides))
+            for mode in args.modes:
+                baseline, peak = peak_rss_mb(input_file, os.path.join(tmp, mode), args.template, mode)
+                growth[mode].append((slides, peak - baseline))
+                print(f"{slides:>8} {mode:>8} {baseline:>12.1f} {peak:>10.1f} {peak - baseline:>10.1f}")
+
+    # Growth per slide between the smallest and the largest deck; the fixed cost of a
+    # conversion cancels out
+    failed = False
+    for mode, points in growth.items():
+        (first_slides, first_mb), (last_slides, last_mb) = min(points), max(points)
+        if last_slides == first_slides:
+            continue
+        kb_per_slide = (last_mb - first_mb) * 1024 / (last_slides - first_slides)
+        print(f"{mode}: {kb_per_slide:.1f} KB per slide")
+        if mode in BOUNDED_MODES and kb_per_slide > args.max_kb_per_slide:
+            print(f"{mode}: exceeds {args.max_kb_per_slide} KB per slide")
+            failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+# Unit tests for conversion limits and cancellation
+
+import threading
+import time
+
+import pytest
+from pptx import Presentation
+
+from MarkdownToPPTX.MarkdownToPPTX import MarkdownToPPTX
+from MarkdownToPPTX.modules import limits as limits_module
+from MarkdownToPPTX.modules.limits import (
+    BudgetExceeded, CancellationToken, ConversionCancelled, ConversionGuard, ConversionLimits, LimitExceeded,
+)
+from MarkdownToPPTX.modules.tables import parse_table
+
+
+# Title slide, then three content slides: four bullets, a 2 x 4 table, a paragraph
+DOC = (
+    "# Title\n\n## One\n- a\n- b\n- c\n- d\n\n---\n\n"
+    "## Two\n| h1 | h2 |\n|---|---|\n| 1 | 2 |\n| 3 | 4 |\n| 5 | 6 |\n\n---\n\n"
+    "## Three\nText\n"
+)
+
+# Parsing this takes seconds, far longer than any budget below
+HUGE_SLIDE = "## Huge\n" + "- item\n" * 500_000
+
+
+def _body_paragraphs(slide):
+    return sum(len(shape.text_frame.paragraphs) for shape in slide.shapes
+               if shape.has_text_frame and shape != slide.shapes.title)
+
+
+def _table_rows(slide):
+    return [len(shape.table.rows) for shape in slide.shapes if shape.has_table]
+
+
+def _parser(limits=None, cancel=None):
+    converter = MarkdownToPPTX()
+    converter.guard = ConversionGuard(limits, cancel)
+    return converter
+
+
+def _convert(tmp_path, limits, markdown=DOC):
+    md_path = tmp_path / 'doc.md'
+    md_path.write_text(markdown, encoding='utf-8')
+    MarkdownToPPTX().convert(str(md_path), str(tmp_path / 'out'), limits=limits)
+    output = tmp_path / 'out' / 'output.pptx'
+    return Presentation(str(output)) if output.exists() else None
+
+
+# cap -> (limits, check of the truncated deck)
+CAPS = {
+    'input bytes': (dict(max_input_bytes=DOC.index('## Two')),
+                    lambda deck: len(deck.slides) == 2),
+    'slide count': (dict(max_slides=3),
+               lambda deck: len(deck.slides) == 3),
+    'table cells': (dict(max_table_cells=5),
+                    lambda deck: _table_rows(deck.slides[2]) == [2]),
+    'items per slide': (dict(max_items_per_slide=2),
+                        lambda deck: _body_paragraphs(deck.slides[1]) == 2),
+}
+
+
+@pytest.mark.parametrize("cap", list(CAPS))
+def test_cap_fails_conversion(tmp_path, capsys, cap):
+    caps, _ = CAPS[cap]
+    assert _convert(tmp_path, ConversionLimits(**caps)) is None
+    assert f"{cap} exceeds the limit" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("cap", list(CAPS))
+def test_cap_truncates_conversion(tmp_path, capsys, cap):
+    caps, check = CAPS[cap]
+    deck = _convert(tmp_path, ConversionLimits(policy='truncate', **caps))
+    assert deck is not None and check(deck)
+    assert "Output truncated" in capsys.readouterr().out
+
+
+def test_within_caps_converts_everything(tmp_path):
+    deck = _convert(tmp_path, ConversionLimits(max_input_bytes=len(DOC), max_slides=4, max_table_cells=8,
+                                               max_items_per_slide=4))
+    assert len(deck.slides) == 4
+    assert _body_paragraphs(deck.slides[1]) == 4
+    assert _table_rows(deck.slides[2]) == [4]
+
+
+def test_item_cap_raises_while_parsing():
+    slides = _parser(ConversionLimits(max_items_per_slide=10)).iter_slides(HUGE_SLIDE)
+    started = time.monotonic()
+    with pytest.raises(LimitExceeded) as info:
+        next(slides)
+    assert info.value.value == 11
+    assert time.monotonic() - started < 0.5
+
+
+@pytest.mark.parametrize("maximum", range(7))
+def test_item_cap_truncates_like_render_time_cap(maximum):
+    # Headers are moved before the other items when a slide is complete
+    markdown = "## S\n- a\n### h1\nText\n- b\n### h2\n- c\n"
+    full = _parser().parse_markdown(markdown)[0]['content']
+    parser = _parser(ConversionLimits(max_items_per_slide=maximum, policy='truncate'))
+    assert parser.parse_markdown(markdown)[0]['content'][:maximum] == full[:maximum]
+    assert parser.guard.truncated == (['items'] if maximum < 4 else [])
+
+
+def test_table_cap_stops_reading_rows():
+    lines = ["| a | b | c |", "|---|---|---|"] + ["| 1 | 2 | 3 |"] * 100_000
+    assert parse_table(lines, max_cells=10).n_rows == 4
+    assert parse_table(lines).n_rows == 100_001
+
+    table = _parser(ConversionLimits(max_table_cells=10, policy='truncate')).parse_markdown(
+        "## T\n" + "\n".join(lines))[0]['content'][0]['table']
+    assert (table.n_rows, table.n_cols) == (3, 3)
+    with pytest.raises(LimitExceeded):
+        _parser(ConversionLimits(max_table_cells=10)).parse_markdown("## T\n" + "\n".join(lines))
+
+
+def test_cancellation_stops_parsing():
+    token = CancellationToken()
+    slides = _parser(cancel=token).iter_slides(HUGE_SLIDE)
+    timer = threading.Timer(0.1, token.cancel, args=("shutting down",))
+    timer.start()
+    started = time.monotonic()
+    try:
+        with pytest.raises(ConversionCancelled, match="shutting down"):
+            next(slides)
+    finally:
+        timer.cancel()
+    assert time.monotonic() - started < 1.0
+
+
+def test_deadline_stops_parsing():
+    slides = _parser(ConversionLimits(timeout_seconds=0.1)).iter_slides(HUGE_SLIDE)
+    started = time.monotonic()
+    with pytest.raises(BudgetExceeded):
+        next(slides)
+    assert time.monotonic() - started < 1.0
+
+
+def test_memory_budget_stops_parsing(monkeypatch):
+    # RSS readings grow by 1 MiB per sample
+    samples = iter(range(0, 1 << 40, 1 << 20))
+    monkeypatch.setattr(limits_module, 'current_rss_bytes', lambda: next(samples))
+    slides = _parser(ConversionLimits(max_memory_bytes=(1 << 20) + 1)).iter_slides(HUGE_SLIDE)
+    with pytest.raises(BudgetExceeded, match="memory budget"):
+        next(slides)
+
+
+def test_cancelled_conversion_writes_nothing(tmp_path, capsys):
+    token = CancellationToken()
+    token.cancel()
+    md_path = tmp_path / 'doc.md'
+    md_path.write_text(DOC, encoding='utf-8')
+    MarkdownToPPTX().convert(str(md_path), str(tmp_path / 'out'), cancel=token)
+    assert list((tmp_path / 'out').iterdir()) == []
+    assert "Error: cancelled" in capsys.readouterr().out
@@ -0,0 +1,186 @@
+# Unit tests for deck merging
+
+import hashlib
+import os
+import zipfile
+
+import pytest
+from lxml import etree
+from pptx import Presentation
+
+from MarkdownToPPTX.MarkdownToPPTX import MarkdownToPPTX
+from MarkdownToPPTX.modules.merge import merge_presentations
+from MarkdownToPPTX.modules.opc import (
+    CT_SLIDE_LAYOUT, CT_SLIDE_MASTER, NS_P, NS_R, RT_SLIDE_LAYOUT, RT_SLIDE_MASTER, PackageReader,
+)
+
+
+TEMPLATES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'assets', 'templates')
+
+# (template, markdown); template.pptx and template01.pptx appear twice so
+# their layouts, masters and media have to be de-duplicated
+DECKS = [
+    ('template.pptx', "# First\n\n## Bullets\n- one\n- **two**\n"),
+    ('template01.pptx', "# Second\n\n## Table\n| a | b |\n|---|---|\n| 1 | 2 |\n\n---\n\n## More\nText\n"),
+    ('template02.pptx', "# Third\n\n## Bullets\n- three\n"),
+    (None, "# Fourth\n\n## Default template\n- four\n"),
+    ('template.pptx', "# Fifth\n\n## Again\n- five\n"),
+    ('template01.pptx', "# Sixth\n\n## Again\n1. six\n"),
+]
+
+MIN_MASTER_ID = 2147483648
+
+
+def _build_decks(directory, decks):
+    paths = []
+    for number, (template, markdown) in enumerate(decks):
+        md_path = directory / f"deck{number}.md"
+        md_path.write_text(markdown, encoding='utf-8')
+        converter = MarkdownToPPTX(template and os.path.join(TEMPLATES, template))
+        converter.convert(str(md_path), str(directory / str(number)))
+        paths.append(str(directory / str(number) / 'output.pptx'))
+    return paths
+
+
+@pytest.fixture(scope='module')
+def decks(tmp_path_factory):
+    return _build_decks(tmp_path_factory.mktemp('decks'), DECKS)
+
+
+@pytest.fixture(scope='module')
+def merged(decks, tmp_path_factory):
+    return merge_presentations(decks, str(tmp_path_factory.mktemp('merged') / 'merged.pptx'))
+
+
+@pytest.fixture(scope='module')
+def renamed_merged(tmp_path_factory):
+    # template.pptx with only the name of slideLayout1 changed: the two masters
+    # differ in one layout, so nothing of the second may be shared with the first
+    directory = tmp_path_factory.mktemp('renamed')
+    renamed = directory / 'renamed.pptx'
+    with zipfile.ZipFile(os.path.join(TEMPLATES, 'template.pptx')) as src, zipfile.ZipFile(renamed, 'w') as dst:
+        for info in src.infolist():
+            data = src.read(info)
+            if info.filename == 'ppt/slideLayouts/slideLayout1.xml':
+                data = data.replace(b'<p:cSld name="', b'<p:cSld name="Renamed ', 1)
+            dst.writestr(info, data)
+    markdown = "# Title\n\n## Slide\n- bullet\n"
+    decks = _build_decks(directory, [('template.pptx', markdown), (str(renamed), markdown),
+                                     ('template.pptx', markdown)])
+    return merge_presentations(decks, str(directory / 'merged.pptx'))
+
+
+@pytest.fixture(params=['templates', 'renamed layout'])
+def any_merged(request):
+    return request.getfixturevalue('merged' if request.param == 'templates' else 'renamed_merged')
+
+
+def _parts_of_type(package, content_type):
+    return sorted(name for name in package.names if package.content_type(name) == content_type)
+
+
+def _layout_key(package, layout):
+    # A layout is a duplicate when both it and its master are
+    digest = hashlib.sha1(package.read(layout))
+    for rel in package.rels(layout):
+        if rel.reltype == RT_SLIDE_MASTER:
+            digest.update(package.read(rel.target))
+    return digest.hexdigest()
+
+
+def _media_keys(package):
+    return [(package.content_type(name), hashlib.sha1(package.read(name)).hexdigest())
+            for name in package.names if name.startswith('ppt/media/')]
+
+
+def test_slides_are_appended_in_order(decks, merged):
+    expected = []
+    for path in decks:
+        with PackageReader(path) as package:
+            expected += [package.read(part) for part in package.slide_parts()]
+
+    with PackageReader(merged) as package:
+        assert [package.read(part) for part in package.slide_parts()] == expected
+    assert len(Presentation(merged).slides) == len(expected)
+
+
+def test_layouts_masters_and_media_are_deduplicated(decks, merged):
+    # layout key -> digest of the layout XML alone; copied masters get new
+    # layout ids, so only the layouts themselves are byte-identical after merging
+    layouts, masters, media = {}, set(), set()
+    for path in decks:
+        with PackageReader(path) as package:
+            for layout in _parts_of_type(package, CT_SLIDE_LAYOUT):
+                layouts[_layout_key(package, layout)] = hashlib.sha1(package.read(layout)).hexdigest()
+            masters.update(hashlib.sha1(package.read(master)).hexdigest()
+                           for master in _parts_of_type(package, CT_SLIDE_MASTER))
+            media.update(_media_keys(package))
+
+    with PackageReader(merged) as package:
+        merged_layouts = [hashlib.sha1(package.read(layout)).hexdigest()
+                          for layout in _parts_of_type(package, CT_SLIDE_LAYOUT)]
+        assert sorted(merged_layouts) == sorted(layouts.values())
+        assert len(_parts_of_type(package, CT_SLIDE_MASTER)) == len(masters)
+        assert sorted(_media_keys(package)) == sorted(media)
+
+
+def test_master_with_a_changed_layout_is_copied_whole(renamed_merged):
+    with PackageReader(renamed_merged) as package:
+        masters = _parts_of_type(package, CT_SLIDE_MASTER)
+        layouts = _parts_of_type(package, CT_SLIDE_LAYOUT)
+        themes = {rel.target for master in masters for rel in package.rels(master) if rel.reltype.endswith('/theme')}
+        assert len(package.slide_parts()) == 6
+    assert len(masters) == 2
+    assert len(layouts) == 12
+    assert len(themes) == 2
+
+
+def test_every_layout_belongs_to_one_master(any_merged):
+    with PackageReader(any_merged) as package:
+        owners = {}
+        for master in _parts_of_type(package, CT_SLIDE_MASTER):
+            for rel in package.rels(master):
+                if rel.reltype == RT_SLIDE_LAYOUT:
+                    assert rel.target not in owners, (rel.target, owners.get(rel.target), master)
+                    owners[rel.target] = master
+        assert sorted(owners) == _parts_of_type(package, CT_SLIDE_LAYOUT)
+        for layout, master in owners.items():
+            back = [rel.target for rel in package.rels(layout) if rel.reltype == RT_SLIDE_MASTER]
+            assert back == [master], layout
+
+
+def test_master_and_layout_ids_are_renumbered(any_merged):
+    with PackageReader(any_merged) as package:
+        presentation = package.main_part()
+        root = etree.fromstring(package.read(presentation))
+        ids = [int(el.get('id')) for el in root.iter(f"{{{NS_P}}}sldMasterId")]
+        for master in _parts_of_type(package, CT_SLIDE_MASTER):
+            ids += [int(el.get('id')) for el in etree.fromstring(package.read(master)).iter(f"{{{NS_P}}}sldLayoutId")]
+        slide_ids = [int(el.get('id')) for el in root.iter(f"{{{NS_P}}}sldId")]
+
+    assert len(set(ids)) == len(ids)
+    assert min(ids) >= MIN_MASTER_ID
+    assert len(set(slide_ids)) == len(slide_ids)
+    assert min(slide_ids) >= 256
+
+
+def test_package_has_no_dangling_relationships(any_merged):
+    with PackageReader(any_merged) as package:
+        sources = [''] + [name for name in package.names if not name.endswith('.rels')]
+        for source in sources:
+            for rel in package.rels(source):
+                assert rel.external or rel.target in package.names, (source, rel)
+
+        # Every r:id used in the id lists resolves to a relationship of its part
+        for part in [package.main_part()] + _parts_of_type(package, CT_SLIDE_MASTER):
+            rIds = {rel.rId for rel in package.rels(part)}
+            for el in etree.fromstring(package.read(part)).iter():
+                rId = el.get(f"{{{NS_R}}}id")
+                assert rId is None or rId in rIds, (part, rId)
+
+
+def test_every_part_has_a_content_type(any_merged):
+    with PackageReader(any_merged) as package:
+        untyped = [name for name in package.names
+                   if name != '[Content_Types].xml' and package.content_type(name) is None]
+        assert untyped == []
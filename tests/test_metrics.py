@@ -0,0 +1,146 @@
+# Unit tests for conversion metrics
+
+import logging
+import os
+import urllib.error
+import urllib.request
+
+import pytest
+
+from MarkdownToPPTX.MarkdownToPPTX import MarkdownToPPTX
+from MarkdownToPPTX.modules.metrics import MetricsRegistry, serve_metrics
+
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'raw', 'sample.md')
+LOGGER = 'MarkdownToPPTX.modules.metrics'
+
+
+def _convert(tmp_path, registry, markdown=None, **kwargs):
+    input_path = SAMPLE
+    if markdown is not None:
+        input_path = str(tmp_path / 'input.md')
+        with open(input_path, 'w', encoding='utf-8') as f:
+            f.write(markdown)
+    MarkdownToPPTX(metrics=registry).convert(input_path, str(tmp_path / 'out'), **kwargs)
+    return input_path
+
+
+def test_exposition_text_keeps_full_precision():
+    registry = MetricsRegistry(prefix='test')
+    registry.conversions.inc()
+    registry.output_bytes.observe(7037034)
+    registry.output_bytes.observe(1048576)
+    registry.parse_seconds.observe(0.0123)
+    lines = registry.render_prometheus().splitlines()
+
+    assert "# HELP test_conversions_total Completed conversions." in lines
+    assert "# TYPE test_conversions_total counter" in lines
+    assert "test_conversions_total 1" in lines
+    assert "# TYPE test_output_bytes histogram" in lines
+    # Buckets are cumulative and le is inclusive
+    assert 'test_output_bytes_bucket{le="262144.0"} 0' in lines
+    assert 'test_output_bytes_bucket{le="1048576.0"} 1' in lines
+    assert 'test_output_bytes_bucket{le="16777216.0"} 2' in lines
+    assert 'test_output_bytes_bucket{le="+Inf"} 2' in lines
+    assert "test_output_bytes_sum 8085610.0" in lines
+    assert "test_output_bytes_count 2" in lines
+    assert 'test_parse_seconds_bucket{le="0.01"} 0' in lines
+    assert 'test_parse_seconds_bucket{le="0.025"} 1' in lines
+    assert "test_parse_seconds_sum 0.0123" in lines
+    assert "test_conversions_in_progress 0" in lines
+
+
+def test_snapshot_after_successful_conversion(tmp_path):
+    registry = MetricsRegistry()
+    _convert(tmp_path, registry)
+    snapshot = registry.snapshot()
+
+    assert snapshot['markdowntopptx_conversions_total'] == (1,)
+    assert snapshot['markdowntopptx_failures_total'] == (0,)
+    assert snapshot['markdowntopptx_slides_total'][0] > 0
+    assert snapshot['markdowntopptx_tables_total'][0] > 0
+    assert snapshot['markdowntopptx_input_bytes'] == (1, os.path.getsize(SAMPLE))
+    output = tmp_path / 'out' / 'output.pptx'
+    assert snapshot['markdowntopptx_output_bytes'] == (1, os.path.getsize(output))
+    for stage in ('parse', 'render', 'save'):
+        assert snapshot[f'markdowntopptx_{stage}_seconds'][0] == 1
+    assert snapshot['markdowntopptx_conversions_in_progress'] == (0,)
+
+
+def test_snapshot_after_failed_conversion(tmp_path, caplog):
+    registry = MetricsRegistry()
+    caplog.set_level(logging.INFO, logger=LOGGER)
+    MarkdownToPPTX(metrics=registry).convert(str(tmp_path / 'missing.md'), str(tmp_path / 'out'))
+
+    snapshot = registry.snapshot()
+    assert snapshot['markdowntopptx_conversions_total'] == (0,)
+    assert snapshot['markdowntopptx_failures_total'] == (1,)
+    assert snapshot['markdowntopptx_conversions_in_progress'] == (0,)
+    assert [record.getMessage().split(' ', 2)[1] for record in caplog.records] == ['status=error']
+    assert 'stage=read error=not_found' in caplog.records[0].getMessage()
+
+
+def test_unexpected_error_is_counted_and_raised(tmp_path, caplog):
+    registry = MetricsRegistry()
+    caplog.set_level(logging.INFO, logger=LOGGER)
+    # python-pptx rejects characters XML cannot hold
+    with pytest.raises(ValueError):
+        _convert(tmp_path, registry, "# T\n\n## S\n- a\ufffeb\n")
+
+    snapshot = registry.snapshot()
+    assert snapshot['markdowntopptx_failures_total'] == (1,)
+    assert snapshot['markdowntopptx_conversions_in_progress'] == (0,)
+    assert 'status=error' in caplog.records[-1].getMessage()
+    assert 'stage=render error=ValueError' in caplog.records[-1].getMessage()
+
+
+def test_log_line_quotes_and_escapes_values(caplog):
+    registry = MetricsRegistry()
+    caplog.set_level(logging.INFO, logger=LOGGER)
+    registry.log_conversion(
+        'ok', input='up load\nstatus=error', output='a=b', name='say "hi"', path='C:\\x',
+        tab='a\tb', empty='', plain='out.pptx', slides=3, seconds=0.5, skipped=None,
+    )
+    assert caplog.records[-1].getMessage() == (
+        'event=conversion status=ok input="up load\\nstatus=error" output="a=b" name="say \\"hi\\"" '
+        'path="C:\\\\x" tab="a\\tb" empty="" plain=out.pptx slides=3 seconds=0.500000'
+    )
+
+
+def test_log_line_escapes_unicode_line_breaks(caplog):
+    registry = MetricsRegistry()
+    caplog.set_level(logging.INFO, logger=LOGGER)
+    registry.log_conversion('ok', input='a\u2028b\x00c\x85')
+    message = caplog.records[-1].getMessage()
+    assert message == 'event=conversion status=ok input="a\\u2028b\\u0000c\\u0085"'
+    assert len(message.splitlines()) == 1
+
+
+def test_write_prometheus_is_readable_by_others(tmp_path):
+    registry = MetricsRegistry()
+    path = tmp_path / 'markdowntopptx.prom'
+    registry.write_prometheus(str(path))
+
+    umask = os.umask(0)
+    os.umask(umask)
+    assert path.stat().st_mode & 0o777 == 0o666 & ~umask
+    assert path.read_text(encoding='utf-8') == registry.render_prometheus()
+    assert os.listdir(tmp_path) == ['markdowntopptx.prom']
+
+
+def test_metrics_endpoint(tmp_path):
+    registry = MetricsRegistry()
+    _convert(tmp_path, registry)
+    server = serve_metrics(registry, port=0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        with urllib.request.urlopen(url + "/metrics?name[]=x") as response:
+            assert response.status == 200
+            assert response.headers['Content-Type'] == 'text/plain; version=0.0.4; charset=utf-8'
+            assert response.read().decode('utf-8') == registry.render_prometheus()
+        with pytest.raises(urllib.error.HTTPError) as info:
+            urllib.request.urlopen(url + "/other")
+        assert info.value.code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,70 @@
+# Unit tests for output naming
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from MarkdownToPPTX.modules.naming import NAMING_SCHEMES, reserve_output_path
+
+
+PROCESSES = 4
+THREADS = 8
+PER_THREAD = 10
+
+
+def _reserve_in_threads(output_dir, scheme, worker):
+    # Runs in a child process: THREADS threads reserving PER_THREAD names each,
+    # released together so they contend for the same counters
+    barrier = threading.Barrier(THREADS)
+    paths = []
+    lock = threading.Lock()
+
+    def reserve(thread):
+        barrier.wait()
+        for call in range(PER_THREAD):
+            # Distinct content per call, so the hash scheme names distinct outputs
+            path = reserve_output_path(output_dir, scheme, input_path='deck.md',
+                                       content=f"{worker}-{thread}-{call}")
+            with lock:
+                paths.append(path)
+
+    threads = [threading.Thread(target=reserve, args=(thread,)) for thread in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return paths
+
+
+@pytest.mark.parametrize("scheme", NAMING_SCHEMES)
+def test_parallel_reservations_are_distinct(tmp_path, scheme):
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(PROCESSES, mp_context=context) as pool:
+        futures = [pool.submit(_reserve_in_threads, str(tmp_path), scheme, worker)
+                   for worker in range(PROCESSES)]
+        paths = [path for future in futures for path in future.result()]
+
+    assert len(paths) == PROCESSES * THREADS * PER_THREAD
+    assert len(set(paths)) == len(paths)
+    assert all(os.path.dirname(path) == str(tmp_path) for path in paths)
+    if scheme != 'hash':
+        # Every name is claimed by a placeholder file
+        assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(path) for path in paths)
+
+
+def test_hash_scheme_is_deterministic(tmp_path):
+    first = reserve_output_path(str(tmp_path), 'hash', input_path='deck.md', content='# A', salt='t')
+    assert reserve_output_path(str(tmp_path), 'hash', input_path='deck.md', content='# A', salt='t') == first
+    assert reserve_output_path(str(tmp_path), 'hash', input_path='deck.md', content='# A', salt='u') != first
+    assert reserve_output_path(str(tmp_path), 'hash', input_path='deck.md', content='# B', salt='t') != first
+
+
+def test_counter_scheme_continues_after_existing_outputs(tmp_path):
+    for name in ('output.pptx', 'output(1).pptx', 'output(7).pptx'):
+        (tmp_path / name).write_bytes(b'x')
+    assert reserve_output_path(str(tmp_path), 'counter') == str(tmp_path / 'output(8).pptx')
+    assert reserve_output_path(str(tmp_path), 'stem', input_path='talk.md') == str(tmp_path / 'talk.pptx')
+    assert reserve_output_path(str(tmp_path), 'stem', input_path='talk.md') == str(tmp_path / 'talk(1).pptx')
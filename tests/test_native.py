@@ -0,0 +1,136 @@
+# Unit tests for the native rendering backend
+
+import os
+import re
+import zipfile
+
+import pytest
+
+from MarkdownToPPTX.MarkdownToPPTX import MarkdownToPPTX, _iter_sections
+from MarkdownToPPTX.modules.limits import CancellationToken
+from MarkdownToPPTX.modules.metrics import MetricsRegistry
+from MarkdownToPPTX.modules.native import NativeDeckWriter
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATES = [None] + [os.path.join(ROOT, 'assets', 'templates', name)
+                      for name in ('template.pptx', 'template01.pptx', 'template02.pptx')]
+
+# Control characters, CJK, XML metacharacters and a table before the first header
+EDGE_CASES = (
+    "| <a> | b & c |\n|:--|--:|\n| 1 | \"2\" |\n\n"
+    "# Title & <Subtitle>\n\n"
+    "## 中文标题 **加粗**\n"
+    "- bell\x07 and vertical\x0btab\n"
+    "- **bold** <tag> & 'quote'\n"
+    "  - nested \x1f unit separator\n"
+    "\t- tab indent 😀\n"
+    "### Sub <header>\n"
+    "Paragraph with \x01 and ]]> and &amp;\n\n"
+    "---\n\n"
+    "## Table\n"
+    "| 左 | 中 | 右 |\n|:---|:---:|---:|\n| a\x02 | **b** | <c> |\n| 1 | 2 |\n\n"
+    "---\n\n"
+    "## Empty bullets\n- \n- **\n"
+)
+
+DOCUMENTS = {
+    'sample': os.path.join(ROOT, 'data', 'raw', 'sample.md'),
+    'sample01': os.path.join(ROOT, 'data', 'raw', 'sample01.md'),
+    'edge cases': EDGE_CASES,
+}
+
+
+def _input(tmp_path, document):
+    if os.path.exists(document):
+        return document
+    path = tmp_path / 'input.md'
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(document)
+    return str(path)
+
+
+def _convert(input_path, output_dir, template, registry=None, **kwargs):
+    MarkdownToPPTX(template, metrics=registry).convert(input_path, str(output_dir), **kwargs)
+    return output_dir / 'output.pptx'
+
+
+def _members(path):
+    with zipfile.ZipFile(path) as package:
+        return {name: package.read(name) for name in package.namelist()}
+
+
+@pytest.mark.parametrize("template", TEMPLATES, ids=lambda t: os.path.basename(t) if t else 'default')
+@pytest.mark.parametrize("document", list(DOCUMENTS))
+def test_native_output_matches_python_pptx(tmp_path, template, document):
+    input_path = _input(tmp_path, DOCUMENTS[document])
+    expected = _members(_convert(input_path, tmp_path / 'pptx', template))
+    actual = _members(_convert(input_path, tmp_path / 'native', template, backend='native'))
+
+    assert sorted(actual) == sorted(expected)
+    assert [name for name in expected if actual[name] != expected[name]] == []
+
+
+@pytest.mark.parametrize("template", TEMPLATES, ids=lambda t: os.path.basename(t) if t else 'default')
+@pytest.mark.parametrize("document", list(DOCUMENTS))
+def test_spooled_output_matches_in_memory_output(tmp_path, template, document):
+    input_path = _input(tmp_path, DOCUMENTS[document])
+    expected = _members(_convert(input_path, tmp_path / 'native', template, backend='native'))
+    actual = _members(_convert(input_path, tmp_path / 'spool', template, backend='native', spool=True))
+
+    assert sorted(actual) == sorted(expected)
+    assert [name for name in expected if actual[name] != expected[name]] == []
+    assert os.listdir(tmp_path / 'spool') == ['output.pptx']
+
+
+@pytest.mark.parametrize("text", [
+    "", "a", "a\n---\nb", "a\n----  \n\n\nb\n---\n", "---\na", "a\n---\n---\nb", "a\n---b\n",
+])
+def test_sections_match_re_split(text):
+    assert list(_iter_sections(text)) == re.split(r'\n---+\s*\n', text)
+
+
+def test_failed_spool_is_removed(tmp_path):
+    input_path = _input(tmp_path, "# T\n\n## One\n- a\n\n---\n\n## Two\n- a\ufffeb\n")
+    registry = MetricsRegistry()
+    with pytest.raises(ValueError, match="must be XML compatible"):
+        _convert(input_path, tmp_path / 'out', TEMPLATES[1], registry, backend='native', spool=True)
+
+    assert os.listdir(tmp_path / 'out') == []
+    assert registry.snapshot()['markdowntopptx_failures_total'] == (1,)
+
+
+def test_cancelled_spool_is_removed(tmp_path, monkeypatch, capsys):
+    input_path = _input(tmp_path, DOCUMENTS['sample'])
+    token = CancellationToken()
+    spooled = []
+    create_content_slide = NativeDeckWriter.create_content_slide
+
+    # Cancel once a slide has been written to the spool file
+    def create_and_cancel(writer, *args):
+        create_content_slide(writer, *args)
+        spooled.extend(os.listdir(tmp_path / 'out'))
+        token.cancel()
+
+    monkeypatch.setattr(NativeDeckWriter, 'create_content_slide', create_and_cancel)
+    registry = MetricsRegistry()
+    _convert(input_path, tmp_path / 'out', TEMPLATES[1], registry, backend='native', spool=True,
+             cancel=token)
+
+    assert "Error: cancelled" in capsys.readouterr().out
+    assert len(spooled) == 1 and spooled[0].endswith('.pptx.tmp')
+    assert os.listdir(tmp_path / 'out') == []
+    assert registry.snapshot()['markdowntopptx_failures_total'] == (1,)
+
+
+@pytest.mark.parametrize("backend", ['pptx', 'native'])
+@pytest.mark.parametrize("text", ["- a\ufffeb", "## Title \uffff", "| a | b\ufffe |\n|---|---|\n| 1 | 2 |"])
+def test_characters_xml_cannot_hold_are_rejected(tmp_path, backend, text):
+    input_path = _input(tmp_path, "# T\n\n## S\n" + text + "\n")
+    registry = MetricsRegistry()
+    with pytest.raises(ValueError, match="must be XML compatible"):
+        _convert(input_path, tmp_path / 'out', TEMPLATES[1], registry, backend=backend)
+
+    assert os.listdir(tmp_path / 'out') == []
+    assert registry.snapshot()['markdowntopptx_conversions_total'] == (0,)
+    assert registry.snapshot()['markdowntopptx_failures_total'] == (1,)
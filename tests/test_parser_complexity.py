@@ -0,0 +1,138 @@
+# Adversarial-input tests for the markdown parser
+
+import gc
+import math
+import random
+import re
+import time
+
+import pytest
+
+from MarkdownToPPTX.MarkdownToPPTX import MarkdownToPPTX
+
+
+converter = MarkdownToPPTX()
+
+# The regexes the linear-time scanners replaced; used as references only
+SEPARATOR_REGEX = re.compile(r'^\s*\|?(\s*:?-+:?\s*\|)+\s*:?-+:?\s*\|?\s*$')
+BOLD_REGEX = re.compile(r'\*\*(.*?)\*\*')
+
+# Every case is timed at SIZE and SIZE * FACTOR
+SIZE = 10000
+FACTOR = 16
+# Largest growth exponent accepted; linear code measures about 1.0, quadratic 2.0
+MAX_EXPONENT = 1.5
+# Absolute budget for the larger input, per unit of size
+SECONDS_PER_UNIT = 20e-6
+REPEAT = 3
+
+# name -> (function under test, input generator for size n)
+CASES = {
+    # table separator detection: long runs of '-' and spaces without a closing pipe
+    "separator: dashes and spaces": (converter._is_table_separator, lambda n: "|" + "- " * n),
+    "separator: cells then garbage": (converter._is_table_separator, lambda n: "|" + "---|" * n + " x"),
+    "separator: colon runs": (converter._is_table_separator, lambda n: "|" + " :-: |" * n + ":"),
+    "separator: dash pipe mix": (converter._is_table_separator, lambda n: "- |" * n + "x"),
+    "table data: wide malformed rows": (
+        converter.parse_table_data, lambda n: ["| a " * n, "|" + "- " * n, "| b " * n]
+    ),
+    # inline bold markers
+    "bold: many spans": (converter.remove_bold_formatting, lambda n: "**a" * n),
+    "bold: unclosed opener": (converter.remove_bold_formatting, lambda n: "**" + "a*" * n),
+    "bold: star runs": (converter.remove_bold_formatting, lambda n: "*" * n),
+    "bold: spans across lines": (converter.remove_bold_formatting, lambda n: "**a\n" * n),
+    # whole documents
+    "document: separator-like lines": (
+        converter.parse_markdown, lambda n: "## T\n" + ("| a | b |\n|" + "- " * 50 + "\n") * (n // 50)
+    ),
+    "document: table without closing pipes": (
+        converter.parse_markdown, lambda n: "## T\n| a | b |\n" + ("|" + " -- " * 20 + "\n") * (n // 20)
+    ),
+    "document: long header and indent": (
+        converter.parse_markdown, lambda n: "#" * n + "\n" + " " * n + "x\n" + " " * n + "- y\n"
+    ),
+    "document: slide separators": (
+        converter.parse_markdown, lambda n: "\n---" + " " * n + "x" + "\n---\n" * (n // 5)
+    ),
+    "document: bold-heavy bullets": (converter.parse_markdown, lambda n: "## T\n" + "- **a** **b\n" * (n // 10)),
+}
+
+
+def best_time(func, arg) -> float:
+    # Garbage collection is paused, as timeit does, so collector passes over
+    # the objects a run creates do not show up as super-linear growth
+    best = math.inf
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(REPEAT):
+            started = time.perf_counter()
+            func(arg)
+            best = min(best, time.perf_counter() - started)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return best
+
+
+@pytest.mark.parametrize("name", list(CASES))
+def test_parser_path_is_linear(name):
+    func, generate = CASES[name]
+    budget = SECONDS_PER_UNIT * SIZE * FACTOR
+
+    small = best_time(func, generate(SIZE))
+    # A quadratic path can already blow the budget on the small input
+    assert small <= budget, f"{name}: {small:.3f}s on the small input"
+    large = best_time(func, generate(SIZE * FACTOR))
+    assert large <= budget, f"{name}: {large:.3f}s exceeds the {budget:.3f}s budget"
+    # Below timer resolution the ratio is noise; only the budget applies
+    if small > 1e-3:
+        exponent = math.log(large / small, FACTOR)
+        assert exponent <= MAX_EXPONENT, f"{name}: growth exponent {exponent:.2f}"
+
+
+def _separator_corpus():
+    corpus = [
+        "", "|", "---", "|---|", "---|---", "|---|---|", "| :--- | :---: | ---: |", ":-:|:-:",
+        "|-|", "| - | - |", "|--|--| x", " |---|--- ", "|:--|--:|", "|::|--|", "|-:-|---|",
+        "| --- |\t--- |", "|---||---|", "- - | -", "|---|---|\n",
+    ]
+    rnd = random.Random(1)
+    corpus += [''.join(rnd.choice('|-: \t x') for _ in range(rnd.randint(0, 12))) for _ in range(20000)]
+    return corpus
+
+
+def _bold_corpus():
+    corpus = [
+        "", "**", "****", "**a**", "**a** b **c**", "**a\nb**", "***a***", "**a**b**", "a ** b ** c",
+        "**中文** text", "**unclosed", "* *a* *", "**a**\n**b**",
+    ]
+    rnd = random.Random(2)
+    corpus += [''.join(rnd.choice('**a\n *') for _ in range(rnd.randint(0, 14))) for _ in range(20000)]
+    return corpus
+
+
+def _old_remove_bold_formatting(text):
+    # The implementation replaced in the linear-time rewrite
+    bold_positions = []
+    clean_text = text
+    offset = 0
+    for match in BOLD_REGEX.finditer(text):
+        start = match.start() - offset
+        end = start + len(match.group(1))
+        bold_positions.append((start, end))
+        clean_text = clean_text[:match.start() - offset] + match.group(1) + clean_text[match.end() - offset:]
+        offset += 4
+    return clean_text, bold_positions
+
+
+def test_table_separator_matches_regex():
+    for line in _separator_corpus():
+        assert converter._is_table_separator(line) == bool(SEPARATOR_REGEX.match(line)), repr(line)
+
+
+def test_bold_spans_match_regex():
+    for text in _bold_corpus():
+        expected = [match.span() for match in BOLD_REGEX.finditer(text)]
+        assert list(converter._find_bold_spans(text)) == expected, repr(text)
+        assert converter.remove_bold_formatting(text) == _old_remove_bold_formatting(text), repr(text)
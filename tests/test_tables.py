@@ -0,0 +1,147 @@
+# Unit tests for table parsing and column layout
+
+import os
+import tracemalloc
+import zipfile
+
+import pytest
+from lxml import etree
+from pptx import Presentation
+from pptx.util import Inches
+
+from MarkdownToPPTX.MarkdownToPPTX import MarkdownToPPTX
+from MarkdownToPPTX.modules import tables
+from MarkdownToPPTX.modules.opc import NS_A
+from MarkdownToPPTX.modules.tables import (
+    ALIGN_CENTER, ALIGN_LEFT, ALIGN_RIGHT, MAX_COLUMN_UNITS, MIN_COLUMN_UNITS, MIN_TABLE_FONT_PT,
+    layout_columns, parse_table, separator_alignments,
+)
+
+
+MIN_WIDTH = 7315200
+MAX_WIDTH = 10363200
+
+TEMPLATE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        'assets', 'templates', 'template.pptx')
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def backend(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(tables, 'np', None)
+    return request.param
+
+
+def test_one_huge_cell_is_sized_without_copying_it(backend):
+    # Padding every cell to the huge one would take 3000 x 40 MB
+    columns = [['x'] * 1000 for _ in range(3)]
+    columns[1][500] = 'y' * 10_000_000
+
+    tracemalloc.start()
+    try:
+        widths, font_pt = layout_columns(columns, MIN_WIDTH, MAX_WIDTH)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    # Less than a single copy of the huge cell
+    assert peak < 10_000_000
+    assert widths == layout_columns([['x'], ['y' * MAX_COLUMN_UNITS], ['x']], MIN_WIDTH, MAX_WIDTH)[0]
+    assert widths[1] > widths[0]
+
+
+def test_column_units(backend):
+    columns = [
+        [''] * 3,
+        ['a' * 10, 'b', ''],
+        ['中文' * 4, 'a\0b', ''],
+        ['😀' * 100, '', ''],
+    ]
+    # 2 units per ASCII character, 4 per CJK character; NUL counts nothing
+    assert tables._column_units(columns) == [MIN_COLUMN_UNITS, 20, 32, MAX_COLUMN_UNITS]
+
+
+@pytest.mark.parametrize("line, alignments", [
+    ("| :--- | :---: | ---: | --- |", [ALIGN_LEFT, ALIGN_CENTER, ALIGN_RIGHT, None]),
+    (":-|-:", [ALIGN_LEFT, ALIGN_RIGHT]),
+    ("  |:-:|---|  ", [ALIGN_CENTER, None]),
+    ("| a | b |", None),
+    ("| --- |", None),
+    ("---", None),
+    ("| --- | x |", None),
+    ("| : | --- |", None),
+    ("| :: | --- |", None),
+    ("| -:- | --- |", None),
+    ("| - - | --- |", None),
+])
+def test_separator_alignments(line, alignments):
+    assert separator_alignments(line) == alignments
+
+
+def test_parse_table_pads_a_column_major_matrix():
+    table = parse_table([
+        "| a | b | c |",
+        "|:--|:-:|",
+        "| 1 |",
+        "|---:|---:|---:|---:|",
+        "| 2 | 3 | 4 | 5 |",
+    ])
+
+    assert table.n_rows == 3
+    assert table.n_cols == 4
+    assert table.columns == [['a', '1', '2'], ['b', '', '3'], ['c', '', '4'], ['', '', '5']]
+    # Only the first separator row counts; columns beyond it have no alignment
+    assert table.alignments == [ALIGN_LEFT, ALIGN_CENTER, None, None]
+    assert table.rows() == [['a', 'b', 'c', ''], ['1', '', '', ''], ['2', '3', '4', '5']]
+
+
+def test_parse_table_without_cells():
+    table = parse_table(["|---|---|", ""])
+
+    assert (table.n_rows, table.n_cols, table.columns, table.alignments) == (0, 0, [], [])
+
+
+def test_parse_table_stops_after_max_cells():
+    table = parse_table(["| a | b |"] * 10, max_cells=5)
+
+    assert table.n_rows == 3
+    assert table.columns == [['a'] * 3, ['b'] * 3]
+
+
+@pytest.mark.parametrize("backend", ['pptx', 'native'])
+def test_wide_table_is_rendered_with_its_layout(tmp_path, backend):
+    n_cols = 60
+    markers = [':---', ':---:', '---:', '---']
+    header = [f"h{col}" for col in range(n_cols)]
+    body = ['x' * (col % 7) for col in range(n_cols)]
+    md_path = tmp_path / 'wide.md'
+    md_path.write_text(
+        "# Wide\n\n## Table\n"
+        + "| " + " | ".join(header) + " |\n"
+        + "|" + "|".join(markers[col % 4] for col in range(n_cols)) + "|\n"
+        + "| " + " | ".join(body) + " |\n",
+        encoding='utf-8',
+    )
+    MarkdownToPPTX(TEMPLATE).convert(str(md_path), str(tmp_path / 'out'), backend=backend)
+
+    with zipfile.ZipFile(tmp_path / 'out' / 'output.pptx') as package:
+        table = etree.fromstring(package.read('ppt/slides/slide2.xml')).find(f".//{{{NS_A}}}tbl")
+    slide_width = Presentation(TEMPLATE).slide_width
+    widths, font_pt = layout_columns([[h, b] for h, b in zip(header, body)], Inches(8), slide_width - 2 * Inches(1))
+
+    assert font_pt == MIN_TABLE_FONT_PT
+    assert [int(col.get('w')) for col in table.iter(f"{{{NS_A}}}gridCol")] == widths
+    assert sum(widths) == slide_width - 2 * Inches(1)
+    assert len(set(widths)) > 1
+
+    rows = table.findall(f"{{{NS_A}}}tr")
+    assert len(rows) == 2
+    for row in rows:
+        cells = row.findall(f"{{{NS_A}}}tc")
+        assert len(cells) == n_cols
+        for col, cell in enumerate(cells):
+            p_pr = cell.find(f".//{{{NS_A}}}pPr")
+            assert p_pr.get('algn') == [ALIGN_LEFT, ALIGN_CENTER, ALIGN_RIGHT, None][col % 4]
+            assert p_pr.find(f"{{{NS_A}}}defRPr").get('sz') == str(MIN_TABLE_FONT_PT * 100)
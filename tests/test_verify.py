@@ -0,0 +1,179 @@
+# Unit tests for deck verification
+
+import json
+import os
+import sys
+import zipfile
+
+import pytest
+from lxml import etree
+
+from MarkdownToPPTX.MarkdownToPPTX import MarkdownToPPTX
+from MarkdownToPPTX.modules import verify
+from MarkdownToPPTX.modules.opc import NS_A
+from MarkdownToPPTX.modules.verify import compare_structures, expected_structure, extract_structure, verify_deck
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATES = [None] + [os.path.join(ROOT, 'assets', 'templates', name)
+                      for name in ('template.pptx', 'template01.pptx', 'template02.pptx')]
+
+DECK = (
+    "# Deck\n\n"
+    "## Slide\n"
+    "- plain item\n"
+    "\t- nested item\n"
+    "- **bold item**\n"
+    "### Sub header\n"
+    "Closing text with a\x07bell\n\n"
+    "| a | b |\n|---|---|\n| 1 | 2 |\n\n"
+    "---\n\n"
+    "## Second\n"
+    "1. first\n"
+    "2. second\n"
+)
+
+DOCUMENTS = {
+    'sample': os.path.join(ROOT, 'data', 'raw', 'sample.md'),
+    'sample01': os.path.join(ROOT, 'data', 'raw', 'sample01.md'),
+    'deck': DECK,
+}
+
+
+def _markdown(document):
+    if os.path.exists(document):
+        with open(document, 'r', encoding='utf-8') as f:
+            return f.read()
+    return document
+
+
+def _convert(tmp_path, markdown, template=None, backend='pptx'):
+    input_path = tmp_path / 'input.md'
+    with open(input_path, 'w', encoding='utf-8', newline='') as f:
+        f.write(markdown)
+    output_dir = tmp_path / backend
+    MarkdownToPPTX(template).convert(str(input_path), str(output_dir), backend=backend)
+    return str(output_dir / 'output.pptx')
+
+
+def _run(element, text):
+    # The a:r element holding the given text
+    return next(t for t in element.iter(f"{{{NS_A}}}t") if t.text == text).getparent()
+
+
+def _edit_slide(deck, output, number, edit):
+    # Copy a deck with one slide's XML edited in place
+    name = f"ppt/slides/slide{number}.xml"
+    with zipfile.ZipFile(deck) as source, zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as target:
+        for info in source.infolist():
+            data = source.read(info)
+            if info.filename == name:
+                root = etree.fromstring(data)
+                edit(root)
+                data = etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+            target.writestr(info, data)
+    return output
+
+
+def _change_text(root):
+    _run(root, 'plain item').find(f"{{{NS_A}}}t").text = 'plain itme'
+
+
+def _change_level(root):
+    _run(root, 'plain item').getparent().find(f"{{{NS_A}}}pPr").set('lvl', '2')
+
+
+def _change_bold(root):
+    _run(root, 'bold item').find(f"{{{NS_A}}}rPr").set('b', '0')
+
+
+def _remove_cell(root):
+    cell = _run(root, '2').getparent().getparent().getparent()
+    cell.getparent().remove(cell)
+
+
+@pytest.mark.parametrize("backend", ['pptx', 'native'])
+@pytest.mark.parametrize("template", TEMPLATES, ids=lambda t: os.path.basename(t) if t else 'default')
+@pytest.mark.parametrize("document", list(DOCUMENTS))
+def test_extracted_structure_matches_markdown(tmp_path, backend, template, document):
+    markdown = _markdown(DOCUMENTS[document])
+    deck = _convert(tmp_path, markdown, template, backend)
+
+    actual = extract_structure(deck)
+    expected = expected_structure(MarkdownToPPTX(), markdown)
+    assert compare_structures(actual, expected) == []
+    assert actual == expected
+
+
+def test_deck_structure_reads_back():
+    structure = expected_structure(MarkdownToPPTX(), DECK)
+
+    assert [slide['title'] for slide in structure] == ['Deck', 'Slide', 'Second']
+    assert structure[1]['paragraphs'][:4] == [
+        {'level': 0, 'text': 'Sub header', 'bold': ['Sub header']},
+        {'level': 0, 'text': 'plain item', 'bold': []},
+        {'level': 1, 'text': 'nested item', 'bold': []},
+        {'level': 0, 'text': 'bold item', 'bold': ['bold item']},
+    ]
+    assert structure[1]['tables'] == [[['a', 'b'], ['1', '2']]]
+
+
+@pytest.mark.parametrize("edit, difference", [
+    (_change_text, "slide 2: paragraph 2 {'level': 0, 'text': 'plain itme'"),
+    (_change_level, "slide 2: paragraph 2 {'level': 2, 'text': 'plain item'"),
+    (_change_bold, "slide 2: paragraph 4 {'level': 0, 'text': 'bold item', 'bold': []}"),
+    (_remove_cell, "slide 2: table 1 [['a', 'b'], ['1']]"),
+])
+@pytest.mark.parametrize("backend", ['pptx', 'native'])
+def test_changed_deck_is_reported(tmp_path, backend, edit, difference):
+    deck = _convert(tmp_path, DECK, TEMPLATES[1], backend)
+    changed = _edit_slide(deck, str(tmp_path / 'changed.pptx'), 2, edit)
+    expected = expected_structure(MarkdownToPPTX(), DECK)
+
+    assert compare_structures(extract_structure(deck), expected) == []
+    differences = compare_structures(extract_structure(changed), expected)
+    assert len(differences) == 1
+    assert differences[0].startswith(difference)
+
+
+def test_compare_structures_reports_slide_count():
+    expected = expected_structure(MarkdownToPPTX(), DECK)
+
+    assert compare_structures(expected[:-1], expected) == ["slide count 2 != expected 3"]
+
+
+def test_golden_snapshot_round_trips(tmp_path):
+    deck = _convert(tmp_path, DECK, TEMPLATES[1])
+    snapshot = str(tmp_path / 'deck.json')
+
+    assert verify_deck(deck, snapshot) == [f"reference '{snapshot}' not found"]
+    assert verify_deck(deck, snapshot, update=True) == []
+    with open(snapshot, 'r', encoding='utf-8') as f:
+        assert json.load(f) == extract_structure(deck)
+    assert verify_deck(deck, snapshot) == []
+
+    changed = _edit_slide(deck, str(tmp_path / 'changed.pptx'), 2, _change_text)
+    assert len(verify_deck(changed, snapshot)) == 1
+
+
+def test_command_line_updates_and_verifies_snapshots(tmp_path, monkeypatch, capsys):
+    deck = _convert(tmp_path, DECK, TEMPLATES[1])
+    golden = tmp_path / 'golden'
+
+    def main(*args):
+        monkeypatch.setattr(sys, 'argv', ['verify', '-j', '1', *args])
+        return verify.main()
+
+    assert main('--golden-dir', str(golden), '--update', deck) == 0
+    assert os.listdir(golden) == ['output.json']
+    assert main('--golden-dir', str(golden), deck) == 0
+    assert "1 deck(s) verified, 0 mismatched" in capsys.readouterr().out
+
+    # Same file name, so it is compared with the snapshot of the original deck
+    changed_dir = tmp_path / 'changed'
+    changed_dir.mkdir()
+    changed = _edit_slide(deck, str(changed_dir / 'output.pptx'), 2, _remove_cell)
+    assert main('--golden-dir', str(golden), changed) == 1
+    out = capsys.readouterr().out
+    assert f"FAIL {changed}" in out
+    assert "slide 2: table 1" in out